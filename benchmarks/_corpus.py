@@ -0,0 +1,50 @@
+"""Synthetic modules shared by the benchmark scripts."""
+
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).parent.parent
+HELPER_FILES = ROOT / "tests" / "helper_files"
+
+sys.path.insert(0, str(ROOT / "src"))
+
+
+def make_module(functions: int = 2000, classes: int = 200, methods: int = 10) -> str:
+    """Build a large module resembling generated code."""
+    parts = ["from typing import Any, Dict, List, Optional\n\n"]
+    for i in range(functions):
+        parts.append(
+            f"def func_{i}(a: int, b: Optional[str] = None) -> Dict[str, Any]:\n"
+            f"    result = {{'a': a, 'b': b, 'i': {i}}}\n"
+            f"    for item in range(a):\n"
+            f"        result[str(item)] = [item * {i}, str(item), None]\n"
+            f"    return result\n\n"
+        )
+    for i in range(classes):
+        parts.append(f"class Model{i}:\n")
+        for j in range(methods):
+            parts.append(
+                f"    def method_{j}(self, value: List[int]) -> int:\n"
+                f"        total = 0\n"
+                f"        for v in value:\n"
+                f"            total += v * {j}\n"
+                f"        return total\n\n"
+            )
+    parts.append(
+        'if __name__ == "__main__":\n'
+        "    for i in range(10):\n"
+        "        print(func_0(i))\n"
+    )
+    return "".join(parts)
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """Return the best wall-clock time of calling func, in seconds."""
+    import time
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
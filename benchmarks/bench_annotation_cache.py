@@ -0,0 +1,31 @@
+"""Measure the annotation cache against rendering every annotation anew.
+
+Usage: python benchmarks/bench_annotation_cache.py
+"""
+
+import ast
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.annotation import AnnotationCache
+from Ast_Stubgen.stubgen import StubGenerator
+
+
+def main() -> None:
+    tree = ast.parse(make_module())
+
+    uncached = best_of(
+        lambda: StubGenerator(annotation_cache=AnnotationCache(maxsize=0)).generate(
+            tree
+        )
+    )
+    cache = AnnotationCache()
+    StubGenerator(annotation_cache=cache).generate(tree)
+    cached = best_of(lambda: StubGenerator(annotation_cache=cache).generate(tree))
+
+    print(f"without cache:          {uncached * 1000:.1f} ms")
+    print(f"with warm cache:        {cached * 1000:.1f} ms")
+    print(f"cache hits / misses:    {cache.hits} / {cache.misses}")
+
+
+if __name__ == "__main__":
+    main()
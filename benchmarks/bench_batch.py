@@ -0,0 +1,41 @@
+"""Compare serial and thread pool batch generation.
+
+The thread pool only scales on free-threaded CPython builds (3.13t and
+later), run this with such an interpreter to see the speed-up.
+
+Usage: python benchmarks/bench_batch.py [workers]
+"""
+
+from pathlib import Path
+import os
+import sys
+import tempfile
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.batch import generate_stubs
+
+
+def main() -> None:
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 4
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        jobs = []
+        source = make_module(functions=300, classes=30)
+        for i in range(32):
+            source_path = Path(tmp_dir) / f"module_{i}.py"
+            source_path.write_text(source)
+            jobs.append((str(source_path), str(source_path) + "i"))
+
+        serial = best_of(lambda: generate_stubs(jobs, max_workers=1), repeat=3)
+        threaded = best_of(lambda: generate_stubs(jobs, max_workers=workers), repeat=3)
+
+    print(f"GIL enabled:            {gil_enabled}")
+    print(f"files:                  {len(jobs)}")
+    print(f"serial:                 {serial * 1000:.1f} ms")
+    print(f"threads ({workers}):            {threaded * 1000:.1f} ms")
+    print(f"speed-up:               {serial / threaded:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Measure the cost of the budget checks and the visiting time they cap.
+
+Parsing can't be interrupted, so the large module is parsed up front and
+only the generator is timed.
+
+Usage: python benchmarks/bench_budget.py
+"""
+
+import ast
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.stubgen import BudgetExceeded, StubGenerator, degraded_stub
+
+TIME_BUDGET = 0.02
+
+
+def main() -> None:
+    tree = ast.parse(make_module())
+    unlimited = best_of(lambda: StubGenerator().generate(tree))
+    budgeted = best_of(
+        lambda: StubGenerator(node_budget=10**9, time_budget=60).generate(tree)
+    )
+    print(f"no budget:              {unlimited * 1000:.1f} ms")
+    print(f"generous budgets:       {budgeted * 1000:.1f} ms")
+
+    large_tree = ast.parse(make_module(functions=10000, classes=1000))
+
+    def generate_degraded() -> None:
+        try:
+            StubGenerator(time_budget=TIME_BUDGET).generate(large_tree)
+        except BudgetExceeded:
+            degraded_stub(large_tree)
+
+    complete = best_of(lambda: StubGenerator().generate(large_tree), repeat=3)
+    degraded = best_of(generate_degraded, repeat=3)
+    print(f"large module, complete: {complete * 1000:.1f} ms")
+    print(f"{TIME_BUDGET * 1000:.0f} ms budget, degraded: {degraded * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
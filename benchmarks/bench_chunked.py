@@ -0,0 +1,43 @@
+"""Compare peak memory of whole-module and statement-wise generation.
+
+Usage: python benchmarks/bench_chunked.py
+"""
+
+from pathlib import Path
+import os
+import tempfile
+import tracemalloc
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.stubgen import generate_stub
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source_path = str(Path(tmp_dir) / "generated.py")
+        Path(source_path).write_text(make_module(functions=10000, classes=1000))
+
+        def whole() -> None:
+            generate_stub(source_path, os.devnull)
+
+        def chunked() -> None:
+            generate_stub(source_path, os.devnull, chunked=True)
+
+        print(f"source size:            {os.path.getsize(source_path) / 2**20:.1f} MiB")
+        print(f"whole module:           {best_of(whole, repeat=1) * 1000:.0f} ms")
+        print(f"chunked:                {best_of(chunked, repeat=1) * 1000:.0f} ms")
+        print(f"whole module peak:      {peak_memory(whole) / 2**20:.1f} MiB")
+        print(f"chunked peak:           {peak_memory(chunked) / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
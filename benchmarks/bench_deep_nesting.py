@@ -0,0 +1,75 @@
+"""Time the explicit stack traversal on pathologically nested input.
+
+The recursive variant visits scheduled members right away, as the
+generator used to, and fails once the nesting exhausts the recursion limit.
+
+Usage: python benchmarks/bench_deep_nesting.py
+"""
+
+import ast
+import time
+
+from _corpus import ROOT  # noqa: F401, sets up the import path
+from Ast_Stubgen.stubgen import StubGenerator
+
+
+class RecursiveGenerator(StubGenerator):
+    def schedule(self, items) -> None:
+        for item in items:
+            if isinstance(item, ast.AST):
+                self.visited_nodes += 1
+                visitor = self.dispatch_table.get(type(item))
+                if visitor is not None:
+                    visitor(self, item)
+            else:
+                item()
+
+
+def nested_ifs(depth: int) -> ast.Module:
+    body = [ast.parse("def f(a: int) -> int:\n    pass").body[0]]
+    for _ in range(depth):
+        body = [ast.If(test=ast.Name(id="x"), body=body, orelse=[])]
+    return ast.Module(body=body, type_ignores=[])
+
+
+def nested_classes(depth: int) -> ast.Module:
+    body = [ast.parse("def f(self) -> int:\n    pass").body[0]]
+    for level in range(depth):
+        body = [
+            ast.ClassDef(
+                name=f"C{level}", bases=[], keywords=[], body=body, decorator_list=[]
+            )
+        ]
+    return ast.Module(body=body, type_ignores=[])
+
+
+def deep_union(terms: int) -> ast.Module:
+    return ast.parse("x: " + " | ".join(["Optional[int]"] * terms))
+
+
+def measure(generator_class, tree: ast.Module) -> str:
+    start = time.perf_counter()
+    try:
+        generator_class().generate(tree)
+    except RecursionError:
+        return "RecursionError"
+    return f"{(time.perf_counter() - start) * 1000:.1f} ms"
+
+
+def main() -> None:
+    cases = [
+        ("ifs, depth 200", nested_ifs(200)),
+        ("ifs, depth 20000", nested_ifs(20000)),
+        ("classes, depth 200", nested_classes(200)),
+        ("classes, depth 1000", nested_classes(1000)),
+        ("union of 900", deep_union(900)),
+    ]
+    print(f"{'case':24}{'recursive':>16}{'explicit stack':>16}")
+    for name, tree in cases:
+        recursive = measure(RecursiveGenerator, tree)
+        explicit = measure(StubGenerator, tree)
+        print(f"{name:24}{recursive:>16}{explicit:>16}")
+
+
+if __name__ == "__main__":
+    main()
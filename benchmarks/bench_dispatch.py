@@ -0,0 +1,86 @@
+"""Compare the dispatch table with the name based lookup of NodeVisitor.
+
+Usage: python benchmarks/bench_dispatch.py
+"""
+
+from pathlib import Path
+import ast
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.stubgen import StubGenerator
+
+
+class NameLookupGenerator(StubGenerator):
+    """The generator dispatching like ast.NodeVisitor.visit()."""
+
+    def drain(self) -> None:
+        pending = self.pending
+        self.draining = True
+        try:
+            while pending:
+                item = pending.pop()
+                if isinstance(item, ast.AST):
+                    self.visited_nodes += 1
+                    visitor = getattr(
+                        self, "visit_" + item.__class__.__name__, self.generic_visit
+                    )
+                    visitor(item)
+                else:
+                    item()
+        finally:
+            self.draining = False
+
+
+class EmptyGenerator(StubGenerator):
+    """Dispatch only, every statement is a no-op."""
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        pass
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        pass
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        pass
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        pass
+
+
+class EmptyNameLookupGenerator(EmptyGenerator):
+    drain = NameLookupGenerator.drain
+
+
+def main() -> None:
+    trees = [ast.parse(make_module())]
+    for path in sorted(Path(ast.__file__).parent.glob("*.py")):
+        try:
+            trees.append(ast.parse(path.read_text(encoding="utf-8")))
+        except (SyntaxError, UnicodeDecodeError):
+            pass
+
+    # Both dispatches have to visit the same nodes for the timings to compare.
+    for names, table in [
+        (EmptyNameLookupGenerator, EmptyGenerator),
+        (NameLookupGenerator, StubGenerator),
+    ]:
+        for tree in trees:
+            names_generator, table_generator = names(), table()
+            assert names_generator.generate(tree) == table_generator.generate(tree)
+            assert names_generator.visited_nodes == table_generator.visited_nodes
+
+    def run(generator_class):
+        def generate_all() -> None:
+            for tree in trees:
+                generator_class().generate(tree)
+
+        return best_of(generate_all)
+
+    print(f"dispatch only, names:   {run(EmptyNameLookupGenerator) * 1000:.1f} ms")
+    print(f"dispatch only, table:   {run(EmptyGenerator) * 1000:.1f} ms")
+    print(f"generation, names:      {run(NameLookupGenerator) * 1000:.1f} ms")
+    print(f"generation, table:      {run(StubGenerator) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Compare parsing the full source with parsing it with elided bodies.
+
+Usage: python benchmarks/bench_elide_bodies.py
+"""
+
+import ast
+import tracemalloc
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.preprocess import elide_function_bodies
+from Ast_Stubgen.stubgen import generate_stub_from_source
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    source = make_module()
+    elided = elide_function_bodies(source)
+
+    full_parse = best_of(lambda: ast.parse(source))
+    elided_parse = best_of(lambda: ast.parse(elided))
+    elide = best_of(lambda: elide_function_bodies(source))
+    full_pipeline = best_of(
+        lambda: generate_stub_from_source(source, "", text_only=True)
+    )
+    elided_pipeline = best_of(
+        lambda: generate_stub_from_source(
+            source, "", text_only=True, elide_bodies=True
+        )
+    )
+
+    print(f"full parse:             {full_parse * 1000:.1f} ms")
+    print(f"elided parse:           {elided_parse * 1000:.1f} ms")
+    print(f"eliding bodies:         {elide * 1000:.1f} ms")
+    print(f"full pipeline:          {full_pipeline * 1000:.1f} ms")
+    print(f"elided pipeline:        {elided_pipeline * 1000:.1f} ms")
+    print(
+        f"full parse peak:        {peak_memory(lambda: ast.parse(source)) / 2**20:.1f} MiB"
+    )
+    print(
+        f"elided parse peak:      {peak_memory(lambda: ast.parse(elided)) / 2**20:.1f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
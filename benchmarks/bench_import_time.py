@@ -0,0 +1,63 @@
+"""Measure the cold import time of the package with -X importtime.
+
+Every run starts a fresh interpreter, like a build tool launching the
+generator once per file. Imports done by the interpreter at startup are
+left out. Pass the src directory of another checkout to compare with it.
+
+Usage: python benchmarks/bench_import_time.py [SRC_DIR]
+"""
+
+import subprocess
+import sys
+
+from _corpus import ROOT
+
+STATEMENTS = [
+    "import Ast_Stubgen",
+    "from Ast_Stubgen import generate_stub",
+    "from Ast_Stubgen import generate_stubs",
+]
+RUNS = 20
+
+
+def import_times(statement: str, src: str) -> dict:
+    """Return the cumulative microseconds of the top-level imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=src,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def best_import_time(statement: str, src: str) -> float:
+    startup = import_times("pass", src)
+    best = float("inf")
+    for _ in range(RUNS):
+        times = import_times(statement, src)
+        total = sum(time for name, time in times.items() if name not in startup)
+        best = min(best, total / 1000)
+    return best
+
+
+def main() -> None:
+    sources = [("this tree", str(ROOT / "src"))]
+    if len(sys.argv) > 1:
+        sources.append((sys.argv[1], sys.argv[1]))
+
+    print(f"best of {RUNS} cold imports, in ms")
+    for statement in STATEMENTS:
+        print(statement)
+        for label, src in sources:
+            print(f"    {label + ':':<36}{best_import_time(statement, src):.1f}")
+
+
+if __name__ == "__main__":
+    main()
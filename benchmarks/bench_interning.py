@@ -0,0 +1,70 @@
+"""Measure the RSS of keeping the stub records of a large batch.
+
+The batch runs in a child process twice, once as is and once with
+sys.intern() replaced by the identity, which leaves the interning of
+identifiers by the parser in place but turns off the generator's own.
+
+Usage: python benchmarks/bench_interning.py
+"""
+
+import subprocess
+import sys
+
+from _corpus import ROOT
+
+MODULES = 400
+FUNCTIONS = 200
+# More distinct annotations than the annotation cache holds.
+MODELS = 6000
+
+CHILD = f"""
+import ast
+import resource
+import sys
+
+if sys.argv[1] == "off":
+    sys.intern = lambda string: string
+sys.path.insert(0, {str(ROOT / "src")!r})
+
+from Ast_Stubgen.annotation import AnnotationCache
+from Ast_Stubgen.stubgen import StubGenerator
+
+
+def make_module(index):
+    parts = ["import typing\\n"]
+    for i in range(index, index + {FUNCTIONS}):
+        model = f"Model{{i * 37 % {MODELS}}}"
+        parts.append(
+            f"import package.{{model.lower()}}\\n"
+            f"def func_{{i}}(value: typing.Optional[{{model}}]) -> typing.List[{{model}}]:\\n"
+            f"    pass\\n"
+        )
+    return "".join(parts)
+
+
+cache = AnnotationCache()
+modules = []
+for index in range({MODULES}):
+    stub_generator = StubGenerator(annotation_cache=cache)
+    stub_generator.collect(ast.parse(make_module(index * 17)))
+    modules.append(stub_generator.module)
+
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def max_rss(interning: str) -> int:
+    output = subprocess.check_output([sys.executable, "-c", CHILD, interning])
+    return int(output)
+
+
+def main() -> None:
+    without = max_rss("off")
+    with_interning = max_rss("on")
+    print(f"{MODULES} modules kept, max RSS in MiB")
+    print(f"without interning:      {without / 1024:.1f}")
+    print(f"with interning:         {with_interning / 1024:.1f}")
+
+
+if __name__ == "__main__":
+    main()
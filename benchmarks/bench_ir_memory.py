@@ -0,0 +1,51 @@
+"""Compare the memory held by the stub records with formatted fragments.
+
+Usage: python benchmarks/bench_ir_memory.py
+"""
+
+import ast
+import tracemalloc
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.ir import iter_fragments, render_module
+from Ast_Stubgen.stubgen import StubGenerator
+
+
+def retained_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        result = func()
+        size = tracemalloc.get_traced_memory()[0]
+        del result
+        return size
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    tree = ast.parse(make_module(functions=20000, classes=2000, methods=10))
+    stub_generator = StubGenerator()
+    stub_generator.collect(tree)
+    body = stub_generator.module.body
+
+    records = retained_memory(lambda: _collect(tree))
+    fragments = retained_memory(
+        lambda: [
+            fragment for record in body for fragment in iter_fragments(record)
+        ]
+    )
+    render = best_of(lambda: render_module(stub_generator.module))
+
+    print(f"records:                {records / 2**20:.1f} MiB")
+    print(f"formatted fragments:    {fragments / 2**20:.1f} MiB")
+    print(f"rendering records:      {render * 1000:.1f} ms")
+
+
+def _collect(tree: ast.Module) -> StubGenerator:
+    stub_generator = StubGenerator()
+    stub_generator.collect(tree)
+    return stub_generator
+
+
+if __name__ == "__main__":
+    main()
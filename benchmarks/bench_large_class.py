@@ -0,0 +1,36 @@
+"""Measure stub generation for classes with very many members.
+
+Usage: python benchmarks/bench_large_class.py
+"""
+
+import ast
+
+from _corpus import best_of
+from Ast_Stubgen.stubgen import StubGenerator
+
+MEMBERS = 10000
+
+
+def main() -> None:
+    bodies = {
+        "methods": "".join(
+            f"    def method_{i}(self, value: int) -> int:\n        return value\n"
+            for i in range(MEMBERS)
+        ),
+        "dataclass fields": "".join(
+            f"    field_{i}: int = {i}\n" for i in range(MEMBERS)
+        ),
+        "TypedDict keys": "".join(
+            f"    key_{i}: list[int]\n" for i in range(MEMBERS)
+        ),
+    }
+    bases = {"methods": "", "dataclass fields": "", "TypedDict keys": "(TypedDict)"}
+
+    for kind, body in bodies.items():
+        tree = ast.parse(f"class Generated{bases[kind]}:\n{body}")
+        elapsed = best_of(lambda: StubGenerator().generate(tree))
+        print(f"{kind + ':':<24}{elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
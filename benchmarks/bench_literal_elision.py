@@ -0,0 +1,26 @@
+"""Measure the elision of large module-level literals.
+
+Usage: python benchmarks/bench_literal_elision.py
+"""
+
+import ast
+
+from _corpus import best_of
+from Ast_Stubgen.stubgen import StubGenerator
+
+
+def main() -> None:
+    table = ", ".join(f"'key{i}': {i}" for i in range(50000))
+    tree = ast.parse(f"TABLE = {{{table}}}\n")
+
+    copied_stub = StubGenerator(literal_size_limit=None).generate(tree)
+    elided_stub = StubGenerator().generate(tree)
+    copied = best_of(lambda: StubGenerator(literal_size_limit=None).generate(tree))
+    elided = best_of(lambda: StubGenerator().generate(tree))
+
+    print(f"copied literal:         {copied * 1000:.1f} ms, {len(copied_stub)} characters")
+    print(f"elided literal:         {elided * 1000:.1f} ms, {len(elided_stub)} characters")
+
+
+if __name__ == "__main__":
+    main()
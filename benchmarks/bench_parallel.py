@@ -0,0 +1,37 @@
+"""Compare serial rendering of one large module with a process pool.
+
+The parts are sent to the workers as trees, pickling them is the main cost,
+so this only pays off with several idle cores.
+
+Usage: python benchmarks/bench_parallel.py [workers]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import ast
+import os
+import sys
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.stubgen import StubGenerator
+
+
+def main() -> None:
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 4
+    tree = ast.parse(make_module(functions=10000, classes=1000))
+
+    serial = best_of(lambda: StubGenerator().generate(tree), repeat=3)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Warm up the pool so the worker start-up is not measured.
+        StubGenerator().generate_parallel(tree, executor, workers)
+        parallel = best_of(
+            lambda: StubGenerator().generate_parallel(tree, executor, workers),
+            repeat=3,
+        )
+
+    print(f"serial:                 {serial * 1000:.0f} ms")
+    print(f"processes ({workers}):          {parallel * 1000:.0f} ms")
+    print(f"speed-up:               {serial / parallel:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Measure the pre-scan for modules that can only contribute imports.
+
+Usage: python benchmarks/bench_prescan.py
+"""
+
+import os
+import tempfile
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.batch import BatchReport, generate_stubs
+from Ast_Stubgen.preprocess import scan_trivial_source
+
+SCRIPTS = 200
+
+
+def make_script(i: int) -> str:
+    """Build a script whose whole code is in its '__main__' block."""
+    body = "".join(
+        f"    result_{j} = [value * {j} for value in range({i})]\n"
+        f"    print(os.path.join('out', str(result_{j})))\n"
+        for j in range(200)
+    )
+    return (
+        f'"""Script {i}."""\nimport os\nimport sys\n\n'
+        f'if __name__ == "__main__":\n{body}'
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = []
+        for i in range(SCRIPTS):
+            path = os.path.join(directory, f"script_{i}.py")
+            with open(path, "w") as script:
+                script.write(make_script(i))
+            jobs.append((path, path + "i"))
+
+        report = BatchReport()
+        generate_stubs(jobs, max_workers=1, report=report)
+        batch = best_of(lambda: generate_stubs(jobs, max_workers=1), repeat=3)
+        print(f"{SCRIPTS} scripts, batch:      {batch * 1000:.1f} ms, {report}")
+
+    script = make_script(0).encode()
+    module = make_module().encode()
+    scan_script = best_of(lambda: scan_trivial_source(script))
+    scan_module = best_of(lambda: scan_trivial_source(module))
+    print(f"scanning a script:      {scan_script * 1000:.2f} ms")
+    print(f"scanning a module:      {scan_module * 1000:.3f} ms (gives up early)")
+
+
+if __name__ == "__main__":
+    main()
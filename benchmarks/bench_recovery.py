@@ -0,0 +1,59 @@
+"""Measure batch throughput with syntax error recovery on a messy tree.
+
+Valid files are parsed once as usual, only broken ones are split into
+statements, so throughput should barely move with a share of them broken.
+
+Usage: python benchmarks/bench_recovery.py
+"""
+
+from pathlib import Path
+import tempfile
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.batch import BatchReport, generate_stubs
+
+FILES = 200
+BROKEN_SHARE = 0.1
+
+
+def write_tree(directory: Path, broken_share: float) -> list:
+    source = make_module(functions=100, classes=10)
+    lines = source.splitlines(keepends=True)
+    middle = len(lines) // 2
+    broken_line = "def broken(a: int -> int:\n"
+    broken = "".join(lines[:middle] + [broken_line] + lines[middle:])
+
+    directory.mkdir()
+    jobs = []
+    broken_every = round(1 / broken_share) if broken_share else 0
+    for index in range(FILES):
+        path = directory / f"module_{index}.py"
+        is_broken = broken_every and index % broken_every == 0
+        path.write_text(broken if is_broken else source)
+        jobs.append((path.as_posix(), f"{path.as_posix()}i"))
+    return jobs
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        valid = write_tree(Path(directory) / "valid", 0)
+        messy = write_tree(Path(directory) / "messy", BROKEN_SHARE)
+
+        plain = best_of(lambda: generate_stubs(valid, max_workers=1), repeat=3)
+        recovering = best_of(
+            lambda: generate_stubs(valid, max_workers=1, recover=True), repeat=3
+        )
+        report = BatchReport()
+        generate_stubs(messy, max_workers=1, report=report, recover=True)
+        messy_time = best_of(
+            lambda: generate_stubs(messy, max_workers=1, recover=True), repeat=3
+        )
+
+    print(f"{FILES} files, {len(report.syntax_errors)} broken in the messy tree")
+    print(f"valid, no recovery:     {FILES / plain:,.0f} files per second")
+    print(f"valid, recovery:        {FILES / recovering:,.0f} files per second")
+    print(f"messy, recovery:        {FILES / messy_time:,.0f} files per second")
+
+
+if __name__ == "__main__":
+    main()
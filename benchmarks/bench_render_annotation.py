@@ -0,0 +1,60 @@
+"""Compare the annotation renderer with ast.unparse().
+
+Usage: python benchmarks/bench_render_annotation.py
+"""
+
+from pathlib import Path
+import ast
+
+from _corpus import HELPER_FILES, best_of, make_module
+from Ast_Stubgen.annotation import render_annotation
+
+
+def collect_annotations() -> list:
+    annotations = []
+    sources = [make_module(functions=500, classes=50)]
+    paths = list(HELPER_FILES.glob("*.py")) + list(Path(ast.__file__).parent.glob("*.py"))
+    for path in paths:
+        try:
+            sources.append(path.read_text(encoding="utf-8"))
+        except UnicodeDecodeError:
+            pass
+
+    for source in sources:
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.arg) and node.annotation is not None:
+                annotations.append(node.annotation)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if node.returns is not None:
+                    annotations.append(node.returns)
+            elif isinstance(node, ast.AnnAssign):
+                annotations.append(node.annotation)
+    return annotations
+
+
+def main() -> None:
+    annotations = collect_annotations()
+
+    def unparse_all() -> None:
+        for node in annotations:
+            ast.unparse(node).strip()
+
+    def render_all() -> None:
+        for node in annotations:
+            render_annotation(node)
+
+    unparse = best_of(unparse_all)
+    render = best_of(render_all)
+
+    print(f"annotations:            {len(annotations)}")
+    print(f"ast.unparse:            {len(annotations) / unparse:,.0f} per second")
+    print(f"render_annotation:      {len(annotations) / render:,.0f} per second")
+    print(f"speed-up:               {unparse / render:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
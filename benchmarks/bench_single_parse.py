@@ -0,0 +1,52 @@
+"""Compare the former parse/unparse/parse front-end with the single parse.
+
+Usage: python benchmarks/bench_single_parse.py
+
+Needs Python 3.9 or newer for ast.unparse().
+"""
+
+import ast
+import typing
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.stubgen import generate_stub_from_source, is_main_block
+
+
+class MainBlockRemover(ast.NodeTransformer):
+    """The transformer the former front-end removed '__main__' blocks with."""
+
+    def visit_If(self, node: ast.If) -> typing.Optional[ast.AST]:
+        if is_main_block(node):
+            return None
+
+        return self.generic_visit(node)
+
+
+def main() -> None:
+    source = make_module()
+
+    def old_front_end() -> None:
+        tree = MainBlockRemover().visit(ast.parse(source))
+        ast.fix_missing_locations(tree)
+        ast.parse(ast.unparse(tree))
+
+    def new_front_end() -> None:
+        ast.parse(source)
+
+    def new_pipeline() -> None:
+        generate_stub_from_source(source, "", text_only=True)
+
+    old = best_of(old_front_end)
+    new = best_of(new_front_end)
+    pipeline = best_of(new_pipeline)
+
+    print(f"source size:            {len(source) / 1024:.0f} KiB")
+    print(f"old front-end:          {old * 1000:.1f} ms")
+    print(f"new front-end:          {new * 1000:.1f} ms")
+    print(f"saving per file:        {(old - new) * 1000:.1f} ms")
+    print(f"new full pipeline:      {pipeline * 1000:.1f} ms")
+    print(f"old full pipeline (est): {(pipeline + old - new) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
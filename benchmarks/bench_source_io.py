@@ -0,0 +1,60 @@
+"""Compare reading a source file as text, as bytes and memory-mapped.
+
+Times cover reading and parsing, peak memory only the reading as the tree
+dwarfs it otherwise. Peak memory is traced Python allocations, the pages of
+a memory-mapped file are not counted as they belong to the page cache.
+
+Usage: python benchmarks/bench_source_io.py
+"""
+
+import ast
+import os
+import tempfile
+import tracemalloc
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.stubgen import map_source
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as source_file:
+        source_file.write(make_module(functions=5000, classes=200))
+    path = source_file.name
+
+    def read_text(parse=ast.parse) -> None:
+        with open(path, "r", encoding="utf-8") as text_file:
+            parse(text_file.read())
+
+    def read_bytes(parse=ast.parse) -> None:
+        with open(path, "rb") as bytes_file:
+            parse(bytes_file.read())
+
+    def read_mapped(parse=ast.parse) -> None:
+        with map_source(path) as source:
+            parse(source)
+
+    try:
+        print(f"file size:              {os.path.getsize(path) / 2**20:.1f} MiB")
+        for name, func in [
+            ("text", read_text),
+            ("bytes", read_bytes),
+            ("mmap", read_mapped),
+        ]:
+            elapsed = best_of(func)
+            peak = peak_memory(lambda: func(parse=len))
+            print(f"{name + ':':<24}{elapsed * 1000:.1f} ms, {peak / 2**20:.1f} MiB")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Check that registering special form handlers doesn't slow down stubbing.
+
+A subclass registers ten class forms and ten call forms that the corpus
+never uses, handlers are looked up by name so the time should not change.
+
+Usage: python benchmarks/bench_special_forms.py
+"""
+
+from pathlib import Path
+import ast
+import gc
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.stubgen import StubGenerator
+
+ROUNDS = 10
+
+
+def make_forms_module(count: int = 2000) -> str:
+    parts = ["from typing import NamedTuple, TypeVar, TypedDict\n\n"]
+    for i in range(count):
+        parts.append(
+            f"T{i} = TypeVar('T{i}')\n"
+            f"VALUES_{i} = frozenset({{{i}, {i + 1}}})\n"
+            f"value_{i} = compute({i})\n"
+            f"class Record{i}(TypedDict):\n    key: int\n"
+            f"class Pair{i}(NamedTuple):\n    left: int\n    right: int\n"
+            f"class Model{i}(Base):\n    field: str\n"
+        )
+    return "".join(parts)
+
+
+def unused_class_form(generator, node, stub, assignments) -> None:
+    raise AssertionError("not in the corpus")
+
+
+def unused_call_form(generator, name, call) -> None:
+    raise AssertionError("not in the corpus")
+
+
+class ManyFormsGenerator(StubGenerator):
+    pass
+
+
+for index in range(10):
+    ManyFormsGenerator.register_class_form(f"UnusedBase{index}", unused_class_form)
+    ManyFormsGenerator.register_call_form(f"unused_call_{index}", unused_call_form)
+
+
+def main() -> None:
+    trees = [ast.parse(make_module()), ast.parse(make_forms_module())]
+    for path in sorted(Path(ast.__file__).parent.glob("*.py")):
+        try:
+            trees.append(ast.parse(path.read_text(encoding="utf-8")))
+        except (SyntaxError, UnicodeDecodeError):
+            pass
+
+    def run(generator_class) -> float:
+        def generate_all() -> None:
+            for tree in trees:
+                generator_class().generate(tree)
+
+        return best_of(generate_all, repeat=1)
+
+    # Alternate the runs, so that both see the same machine load.
+    builtin = extended = float("inf")
+    for _ in range(ROUNDS):
+        gc.collect()
+        builtin = min(builtin, run(StubGenerator))
+        gc.collect()
+        extended = min(extended, run(ManyFormsGenerator))
+    print(f"built-in forms only:    {builtin * 1000:.1f} ms")
+    print(f"ten more of each:       {extended * 1000:.1f} ms")
+    print(f"ratio:                  {extended / builtin:.3f}")
+
+
+if __name__ == "__main__":
+    main()
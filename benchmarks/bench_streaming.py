@@ -0,0 +1,42 @@
+"""Compare peak memory of building the stub text with streaming it.
+
+The parsed tree is built before measuring, so the peaks only cover the
+stub generation and output.
+
+Usage: python benchmarks/bench_streaming.py
+"""
+
+import ast
+import os
+import tracemalloc
+
+from _corpus import make_module
+from Ast_Stubgen.stubgen import StubGenerator
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    tree = ast.parse(make_module(functions=20000, classes=2000))
+
+    def build_text() -> None:
+        with open(os.devnull, "w") as output_file:
+            output_file.write(StubGenerator().generate(tree))
+
+    def stream() -> None:
+        with open(os.devnull, "w") as output_file:
+            output_file.writelines(StubGenerator().iter_lines(tree))
+
+    print(f"build text peak:        {peak_memory(build_text) / 2**20:.1f} MiB")
+    print(f"streaming peak:         {peak_memory(stream) / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compare the expression unparser with astunparse and ast.unparse().
+
+astunparse (with six) was the fallback before Python 3.9. It is imported
+from the directory given on the command line, else from the installed
+packages, and left out when it can't be found. Import times are measured
+in a fresh interpreter that has already imported ast, for the module alone
+rather than the whole package.
+
+Usage: python benchmarks/bench_unparse.py [ASTUNPARSE_DIR]
+"""
+
+from pathlib import Path
+import ast
+import subprocess
+import sys
+
+from _corpus import HELPER_FILES, ROOT, best_of, make_module
+from Ast_Stubgen._unparse import unparse
+
+
+def collect_expressions() -> list:
+    """The expressions the generator unparses: assigned values and arguments."""
+    expressions = []
+    sources = [make_module(functions=500, classes=50)]
+    paths = list(HELPER_FILES.glob("*.py")) + list(Path(ast.__file__).parent.glob("*.py"))
+    for path in paths:
+        try:
+            sources.append(path.read_text(encoding="utf-8"))
+        except UnicodeDecodeError:
+            pass
+
+    for source in sources:
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value:
+                expressions.append(node.value)
+            elif isinstance(node, ast.Call):
+                expressions.extend(node.args)
+    return expressions
+
+
+def import_time(statement: str) -> float:
+    code = (
+        "import ast, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    best = float("inf")
+    for _ in range(5):
+        output = subprocess.check_output(
+            [sys.executable, "-c", code], cwd=ROOT / "src" / "Ast_Stubgen"
+        )
+        best = min(best, float(output))
+    return best
+
+
+def main() -> None:
+    astunparse_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    if astunparse_dir is not None:
+        sys.path.insert(0, astunparse_dir)
+    try:
+        import astunparse
+    except ImportError:
+        astunparse = None
+
+    expressions = collect_expressions()
+    candidates = [("ast.unparse", ast.unparse), ("_unparse.unparse", unparse)]
+    if astunparse is not None:
+        candidates.append(("astunparse.unparse", astunparse.unparse))
+
+    print(f"expressions:            {len(expressions)}")
+    for name, function in candidates:
+
+        def unparse_all() -> None:
+            for node in expressions:
+                function(node)
+
+        seconds = best_of(unparse_all)
+        print(f"{name + ':':<24}{len(expressions) / seconds:,.0f} per second")
+
+    print("import time in ms")
+    statement = "import _unparse"
+    print(f"{'_unparse:':<24}{import_time(statement) * 1000:.1f}")
+    if astunparse_dir is not None:
+        statement = f"import sys; sys.path.insert(0, {astunparse_dir!r})\n"
+    else:
+        statement = ""
+    if astunparse is not None:
+        statement += "import astunparse"
+        print(f"{'astunparse:':<24}{import_time(statement) * 1000:.1f}")
+
+
+if __name__ == "__main__":
+    main()
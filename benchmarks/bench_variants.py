@@ -0,0 +1,32 @@
+"""Compare generating every stub variant separately with one shared pass.
+
+Usage: python benchmarks/bench_variants.py
+"""
+
+from _corpus import best_of, make_module
+from Ast_Stubgen.ir import RenderTarget
+from Ast_Stubgen.stubgen import generate_stub_from_source, generate_stub_variants
+
+TARGETS = [
+    RenderTarget(version=version, typing_module=typing_module)
+    for version in [(3, 8), (3, 9), (3, 10), (3, 11), (3, 12)]
+    for typing_module in ["typing", "typing_extensions"]
+]
+
+
+def main() -> None:
+    source = make_module()
+
+    separate = best_of(
+        lambda: [
+            generate_stub_from_source(source, "", text_only=True) for _ in TARGETS
+        ]
+    )
+    shared = best_of(lambda: generate_stub_variants(source, TARGETS))
+
+    print(f"{len(TARGETS)} separate runs:       {separate * 1000:.1f} ms")
+    print(f"{len(TARGETS)} variants, one parse: {shared * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Count the nodes visited with and without pruning on the standard library.
+
+Usage: python benchmarks/bench_visited_nodes.py
+"""
+
+from pathlib import Path
+import ast
+import time
+
+from _corpus import ROOT  # noqa: F401, sets up the import path
+from Ast_Stubgen.stubgen import StubGenerator, is_main_block
+
+
+class FullDescentGenerator(StubGenerator):
+    """The generator as it was, descending into every unhandled node."""
+
+    generic_visit = ast.NodeVisitor.generic_visit
+    visit_Module = ast.NodeVisitor.generic_visit
+    visit_Try = ast.NodeVisitor.generic_visit
+    visit_TryStar = ast.NodeVisitor.generic_visit
+
+    def visit_If(self, node: ast.If) -> None:
+        if not is_main_block(node):
+            self.generic_visit(node)
+
+
+def run(generator_class, trees) -> tuple:
+    visited = 0
+    start = time.perf_counter()
+    for tree in trees:
+        generator = generator_class()
+        try:
+            generator.generate(tree)
+        except Exception:
+            # The generator does not support every construct of the corpus.
+            pass
+        visited += generator.visited_nodes
+    return visited, time.perf_counter() - start
+
+
+def main() -> None:
+    trees = []
+    for path in sorted(Path(ast.__file__).parent.glob("*.py")):
+        try:
+            trees.append(ast.parse(path.read_text(encoding="utf-8")))
+        except (SyntaxError, UnicodeDecodeError):
+            pass
+
+    full_visits, full_time = run(FullDescentGenerator, trees)
+    pruned_visits, pruned_time = run(StubGenerator, trees)
+
+    print(f"modules:                {len(trees)}")
+    print(f"nodes visited, full:    {full_visits}")
+    print(f"nodes visited, pruned:  {pruned_visits}")
+    print(f"nodes avoided:          {full_visits - pruned_visits}")
+    print(f"full descent:           {full_time * 1000:.0f} ms")
+    print(f"pruned:                 {pruned_time * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
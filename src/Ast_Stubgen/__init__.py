@@ -1,5 +1,49 @@
-"""Generate stub files for Python modules."""
+"""Generate stub files for Python modules.
 
-from .stubgen import generate_text_stub, generate_stub
+The submodules are imported on first use of the names below, so importing
+the package stays cheap for short-lived processes.
+"""
 
-__all__ = ["generate_text_stub", "generate_stub"]
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .batch import BatchReport, generate_stubs
+    from .ir import RenderTarget
+    from .stubgen import (
+        StubGenerator,
+        generate_stub,
+        generate_stub_from_ast,
+        generate_stub_variants,
+        generate_text_stub,
+        iter_stub_lines,
+        write_stub,
+    )
+
+# Public name to the submodule defining it.
+_EXPORTS = {
+    "BatchReport": "batch",
+    "RenderTarget": "ir",
+    "StubGenerator": "stubgen",
+    "generate_text_stub": "stubgen",
+    "generate_stub": "stubgen",
+    "generate_stub_from_ast": "stubgen",
+    "generate_stub_variants": "stubgen",
+    "generate_stubs": "batch",
+    "iter_stub_lines": "stubgen",
+    "write_stub": "stubgen",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> object:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = __import__(f"{__name__}.{module_name}", fromlist=[name])
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_EXPORTS))
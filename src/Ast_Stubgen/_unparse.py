@@ -0,0 +1,410 @@
+"""Expression unparser for Python versions without ast.unparse().
+
+Only expressions are supported, which is all the stub generator unparses:
+assigned values, annotations and call arguments. The output follows
+ast.unparse() of Python 3.11.
+"""
+
+from __future__ import annotations
+import ast
+import sys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+# Binding strength of the expression forms, like ast._Precedence.
+_NAMED_EXPR = 1
+_TUPLE = 2
+_YIELD = 3
+_TEST = 4
+_OR = 5
+_AND = 6
+_NOT = 7
+_CMP = 8
+_EXPR = 9
+_BOR = _EXPR
+_BXOR = 10
+_BAND = 11
+_SHIFT = 12
+_ARITH = 13
+_TERM = 14
+_FACTOR = 15
+_POWER = 16
+_AWAIT = 17
+_ATOM = 18
+
+_BINARY_OPERATORS = {
+    ast.Add: ("+", _ARITH),
+    ast.Sub: ("-", _ARITH),
+    ast.Mult: ("*", _TERM),
+    ast.MatMult: ("@", _TERM),
+    ast.Div: ("/", _TERM),
+    ast.Mod: ("%", _TERM),
+    ast.FloorDiv: ("//", _TERM),
+    ast.Pow: ("**", _POWER),
+    ast.LShift: ("<<", _SHIFT),
+    ast.RShift: (">>", _SHIFT),
+    ast.BitOr: ("|", _BOR),
+    ast.BitXor: ("^", _BXOR),
+    ast.BitAnd: ("&", _BAND),
+}
+_UNARY_OPERATORS = {
+    ast.Not: ("not", _NOT),
+    ast.Invert: ("~", _FACTOR),
+    ast.UAdd: ("+", _FACTOR),
+    ast.USub: ("-", _FACTOR),
+}
+_COMPARISON_OPERATORS = {
+    ast.Eq: "==",
+    ast.NotEq: "!=",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.Is: "is",
+    ast.IsNot: "is not",
+    ast.In: "in",
+    ast.NotIn: "not in",
+}
+_BOOLEAN_OPERATORS = {ast.And: ("and", _AND), ast.Or: ("or", _OR)}
+
+_INFSTR = "1e" + repr(sys.float_info.max_10_exp + 1)
+_SINGLE_QUOTES = ("'", '"')
+_MULTI_QUOTES = ('"""', "'''")
+_ALL_QUOTES = (*_SINGLE_QUOTES, *_MULTI_QUOTES)
+
+# Wraps subscript slices before Python 3.9.
+_INDEX = getattr(ast, "Index", None) if sys.version_info < (3, 9) else None
+
+
+def unparse(node: ast.AST) -> str:
+    """Return the source text of an expression node."""
+    return _Unparser().expression(node, _TEST)
+
+
+def _str_literal(
+    string: str,
+    quote_types: typing.Sequence[str] = _ALL_QUOTES,
+    escape_special_whitespace: bool = False,
+) -> typing.Tuple[str, list[str]]:
+    """Escape a string and find the quotes that can delimit it."""
+
+    def escape_char(char: str) -> str:
+        if not escape_special_whitespace and char in "\n\t":
+            return char
+        if char == "\\" or not char.isprintable():
+            return char.encode("unicode_escape").decode("ascii")
+        return char
+
+    escaped = "".join(map(escape_char, string))
+    possible_quotes = list(quote_types)
+    if "\n" in escaped:
+        possible_quotes = [quote for quote in possible_quotes if quote in _MULTI_QUOTES]
+    possible_quotes = [quote for quote in possible_quotes if quote not in escaped]
+    if not possible_quotes:
+        string = repr(string)
+        quote = next((quote for quote in quote_types if string[0] in quote), string[0])
+        return string[1:-1], [quote]
+    if escaped:
+        # Prefer quotes that need no escaping of the last character.
+        possible_quotes.sort(key=lambda quote: quote[0] == escaped[-1])
+        if possible_quotes[0][0] == escaped[-1]:
+            escaped = escaped[:-1] + "\\" + escaped[-1]
+    return escaped, possible_quotes
+
+
+class _Unparser:
+    """Renders expressions to text, one method per node type."""
+
+    def __init__(self, avoid_backslashes: bool = False) -> None:
+        self.avoid_backslashes = avoid_backslashes
+
+    def expression(self, node: ast.AST, precedence: int) -> str:
+        """Render a node where an expression of precedence is expected."""
+        method = getattr(self, "_" + type(node).__name__, None)
+        if method is None:
+            raise ValueError(f"Can't unparse {type(node).__name__} nodes")
+        return method(node, precedence)
+
+    def items(self, nodes: typing.Sequence[ast.AST], precedence: int = _TEST) -> str:
+        return ", ".join(self.expression(node, precedence) for node in nodes)
+
+    def _Name(self, node: ast.Name, precedence: int) -> str:
+        return node.id
+
+    def _Constant(self, node: ast.Constant, precedence: int) -> str:
+        value = node.value
+        if isinstance(value, tuple):
+            if len(value) == 1:
+                return f"({self.constant(value[0])},)"
+            return "(" + ", ".join(map(self.constant, value)) + ")"
+        elif value is Ellipsis:
+            return "..."
+        return ("u" if node.kind == "u" else "") + self.constant(value)
+
+    def constant(self, value: typing.Any) -> str:
+        if isinstance(value, (float, complex)):
+            # Infinities come from overflowing literals, NaNs from inf - inf.
+            return (
+                repr(value)
+                .replace("inf", _INFSTR)
+                .replace("nan", f"({_INFSTR}-{_INFSTR})")
+            )
+        elif self.avoid_backslashes and isinstance(value, str):
+            string, quote_types = _str_literal(value)
+            return f"{quote_types[0]}{string}{quote_types[0]}"
+        elif value is Ellipsis:
+            return "..."
+        return repr(value)
+
+    def _JoinedStr(self, node: ast.JoinedStr, precedence: int) -> str:
+        if self.avoid_backslashes:
+            string, quote_types = _str_literal(self.fstring_inner(node))
+            return f"f{quote_types[0]}{string}{quote_types[0]}"
+
+        # Escaped whitespace is preferred in the constant parts.
+        parts = []
+        quote_types: typing.Sequence[str] = _ALL_QUOTES
+        for value in node.values:
+            part, quote_types = _str_literal(
+                self.fstring_inner(value),
+                quote_types=quote_types,
+                escape_special_whitespace=isinstance(value, ast.Constant),
+            )
+            parts.append(part)
+        return f"f{quote_types[0]}{''.join(parts)}{quote_types[0]}"
+
+    def fstring_inner(self, node: ast.AST) -> str:
+        if isinstance(node, ast.JoinedStr):
+            return "".join(self.fstring_inner(value) for value in node.values)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value.replace("{", "{{").replace("}", "}}")
+        elif isinstance(node, ast.FormattedValue):
+            return self._FormattedValue(node, _TEST)
+        raise ValueError(f"Unexpected node inside JoinedStr, {node!r}")
+
+    def _FormattedValue(self, node: ast.FormattedValue, precedence: int) -> str:
+        expression = _Unparser(avoid_backslashes=True).expression(
+            node.value, _TEST + 1
+        )
+        if "\\" in expression:
+            raise ValueError("Unable to avoid backslash in f-string expression part")
+        if expression.startswith("{"):
+            # Separate the opening brackets as "{ {".
+            expression = " " + expression
+        text = "{" + expression
+        if node.conversion != -1:
+            text += f"!{chr(node.conversion)}"
+        if node.format_spec:
+            text += ":" + self.fstring_inner(node.format_spec)
+        return text + "}"
+
+    def _Attribute(self, node: ast.Attribute, precedence: int) -> str:
+        value = self.expression(node.value, _ATOM)
+        # 1.real is read as a float, 1 .real is not.
+        if isinstance(node.value, ast.Constant) and isinstance(node.value.value, int):
+            value += " "
+        return f"{value}.{node.attr}"
+
+    def _Subscript(self, node: ast.Subscript, precedence: int) -> str:
+        value = self.expression(node.value, _ATOM)
+        index = node.slice
+        if _INDEX is not None and isinstance(index, _INDEX):
+            index = index.value  # type: ignore
+        if isinstance(index, ast.Tuple) and index.elts:
+            return f"{value}[{self.sequence(index.elts)}]"
+        return f"{value}[{self.expression(index, _TEST)}]"
+
+    def _ExtSlice(self, node: typing.Any, precedence: int) -> str:
+        return self.sequence(node.dims)
+
+    def _Index(self, node: typing.Any, precedence: int) -> str:
+        return self.expression(node.value, precedence)
+
+    def _Slice(self, node: ast.Slice, precedence: int) -> str:
+        text = self.expression(node.lower, _TEST) if node.lower else ""
+        text += ":"
+        if node.upper:
+            text += self.expression(node.upper, _TEST)
+        if node.step:
+            text += ":" + self.expression(node.step, _TEST)
+        return text
+
+    def sequence(self, elements: typing.Sequence[ast.AST]) -> str:
+        """Render elements separated by commas, a single one with a comma."""
+        if len(elements) == 1:
+            return self.expression(elements[0], _TEST) + ","
+        return self.items(elements)
+
+    def _Tuple(self, node: ast.Tuple, precedence: int) -> str:
+        text = self.sequence(node.elts)
+        if not node.elts or precedence > _TUPLE:
+            return f"({text})"
+        return text
+
+    def _List(self, node: ast.List, precedence: int) -> str:
+        return f"[{self.items(node.elts)}]"
+
+    def _Set(self, node: ast.Set, precedence: int) -> str:
+        if not node.elts:
+            # {} is an empty dict.
+            return "{*()}"
+        return "{" + self.items(node.elts) + "}"
+
+    def _Dict(self, node: ast.Dict, precedence: int) -> str:
+        items = []
+        for key, value in zip(node.keys, node.values):
+            if key is None:
+                items.append("**" + self.expression(value, _EXPR))
+            else:
+                items.append(
+                    f"{self.expression(key, _TEST)}: {self.expression(value, _TEST)}"
+                )
+        return "{" + ", ".join(items) + "}"
+
+    def _Starred(self, node: ast.Starred, precedence: int) -> str:
+        return "*" + self.expression(node.value, _EXPR)
+
+    def _NamedExpr(self, node: ast.NamedExpr, precedence: int) -> str:
+        text = (
+            f"{self.expression(node.target, _ATOM)} := "
+            f"{self.expression(node.value, _ATOM)}"
+        )
+        return f"({text})" if precedence > _NAMED_EXPR else text
+
+    def _BinOp(self, node: ast.BinOp, precedence: int) -> str:
+        operator, own = _BINARY_OPERATORS[type(node.op)]
+        # ** binds right to left, everything else left to right.
+        if own == _POWER:
+            left_precedence, right_precedence = own + 1, own
+        else:
+            left_precedence, right_precedence = own, own + 1
+        text = (
+            f"{self.expression(node.left, left_precedence)} {operator} "
+            f"{self.expression(node.right, right_precedence)}"
+        )
+        return f"({text})" if precedence > own else text
+
+    def _UnaryOp(self, node: ast.UnaryOp, precedence: int) -> str:
+        operator, own = _UNARY_OPERATORS[type(node.op)]
+        # Factor prefixes stay next to their operand, like -1.
+        separator = "" if own == _FACTOR else " "
+        text = operator + separator + self.expression(node.operand, own)
+        return f"({text})" if precedence > own else text
+
+    def _BoolOp(self, node: ast.BoolOp, precedence: int) -> str:
+        operator, own = _BOOLEAN_OPERATORS[type(node.op)]
+        # Every further value binds tighter, like in ast.unparse().
+        text = f" {operator} ".join(
+            self.expression(value, own + index)
+            for index, value in enumerate(node.values, 1)
+        )
+        return f"({text})" if precedence > own else text
+
+    def _Compare(self, node: ast.Compare, precedence: int) -> str:
+        text = self.expression(node.left, _CMP + 1)
+        for operator, comparator in zip(node.ops, node.comparators):
+            text += (
+                f" {_COMPARISON_OPERATORS[type(operator)]} "
+                f"{self.expression(comparator, _CMP + 1)}"
+            )
+        return f"({text})" if precedence > _CMP else text
+
+    def _IfExp(self, node: ast.IfExp, precedence: int) -> str:
+        text = (
+            f"{self.expression(node.body, _TEST + 1)} if "
+            f"{self.expression(node.test, _TEST + 1)} else "
+            f"{self.expression(node.orelse, _TEST)}"
+        )
+        return f"({text})" if precedence > _TEST else text
+
+    def _Lambda(self, node: ast.Lambda, precedence: int) -> str:
+        arguments = self._arguments(node.args, _TEST)
+        text = "lambda"
+        if arguments:
+            text += " " + arguments
+        text += ": " + self.expression(node.body, _TEST)
+        return f"({text})" if precedence > _TEST else text
+
+    def _Await(self, node: ast.Await, precedence: int) -> str:
+        text = "await " + self.expression(node.value, _ATOM)
+        return f"({text})" if precedence > _AWAIT else text
+
+    def _Yield(self, node: ast.Yield, precedence: int) -> str:
+        text = "yield"
+        if node.value:
+            text += " " + self.expression(node.value, _ATOM)
+        return f"({text})" if precedence > _YIELD else text
+
+    def _YieldFrom(self, node: ast.YieldFrom, precedence: int) -> str:
+        text = "yield from " + self.expression(node.value, _ATOM)
+        return f"({text})" if precedence > _YIELD else text
+
+    def _Call(self, node: ast.Call, precedence: int) -> str:
+        arguments = [self.expression(arg, _TEST) for arg in node.args]
+        arguments.extend(self._keyword(keyword, _TEST) for keyword in node.keywords)
+        return f"{self.expression(node.func, _ATOM)}({', '.join(arguments)})"
+
+    def _keyword(self, node: ast.keyword, precedence: int) -> str:
+        if node.arg is None:
+            return "**" + self.expression(node.value, _TEST)
+        return f"{node.arg}={self.expression(node.value, _TEST)}"
+
+    def _ListComp(self, node: ast.ListComp, precedence: int) -> str:
+        return f"[{self.expression(node.elt, _TEST)}{self.generators(node)}]"
+
+    def _SetComp(self, node: ast.SetComp, precedence: int) -> str:
+        return "{" + self.expression(node.elt, _TEST) + self.generators(node) + "}"
+
+    def _GeneratorExp(self, node: ast.GeneratorExp, precedence: int) -> str:
+        return f"({self.expression(node.elt, _TEST)}{self.generators(node)})"
+
+    def _DictComp(self, node: ast.DictComp, precedence: int) -> str:
+        return (
+            "{"
+            + f"{self.expression(node.key, _TEST)}: "
+            + f"{self.expression(node.value, _TEST)}{self.generators(node)}"
+            + "}"
+        )
+
+    def generators(self, node: typing.Any) -> str:
+        text = ""
+        for generator in node.generators:
+            text += " async for " if generator.is_async else " for "
+            text += self.expression(generator.target, _TUPLE)
+            text += " in " + self.expression(generator.iter, _TEST + 1)
+            for condition in generator.ifs:
+                text += " if " + self.expression(condition, _TEST + 1)
+        return text
+
+    def _arg(self, node: ast.arg, precedence: int) -> str:
+        if node.annotation:
+            return f"{node.arg}: {self.expression(node.annotation, _TEST)}"
+        return node.arg
+
+    def _arguments(self, node: ast.arguments, precedence: int) -> str:
+        parts = []
+        positional = [*getattr(node, "posonlyargs", ()), *node.args]
+        defaults = [None] * (len(positional) - len(node.defaults)) + node.defaults
+        for index, (arg, default) in enumerate(zip(positional, defaults), 1):
+            part = self._arg(arg, _TEST)
+            if default is not None:
+                part += "=" + self.expression(default, _TEST)
+            parts.append(part)
+            if index == len(getattr(node, "posonlyargs", ())):
+                parts.append("/")
+
+        if node.vararg:
+            parts.append("*" + self._arg(node.vararg, _TEST))
+        elif node.kwonlyargs:
+            parts.append("*")
+        for arg, default in zip(node.kwonlyargs, node.kw_defaults):
+            part = self._arg(arg, _TEST)
+            if default is not None:
+                part += "=" + self.expression(default, _TEST)
+            parts.append(part)
+
+        if node.kwarg:
+            parts.append("**" + self._arg(node.kwarg, _TEST))
+        return ", ".join(parts)
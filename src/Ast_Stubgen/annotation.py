@@ -0,0 +1,206 @@
+"""Fast rendering of type annotations with a shared cache."""
+
+from __future__ import annotations
+from collections import OrderedDict
+import ast
+import sys
+import threading
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+if sys.version_info >= (3, 9):
+    from ast import unparse
+
+    _INDEX = None
+else:
+    from ._unparse import _INDEX, unparse
+
+
+def annotation_key(node: ast.AST) -> typing.Hashable:
+    """Return a hashable key that is equal for structurally equal annotations.
+
+    The key lists the nodes in pre-order, the common type expression nodes as
+    cheap tags and anything else as its ast.dump(). The tree is walked with an
+    explicit stack, so its depth is not bound by the recursion limit.
+    """
+    key: list[typing.Hashable] = []
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        node_type = type(node)
+        if node_type is ast.Name:
+            key.append(node.id)  # type: ignore
+        elif node_type is ast.Attribute:
+            key.append((".", node.attr))  # type: ignore
+            pending.append(node.value)  # type: ignore
+        elif node_type is ast.Subscript:
+            key.append("[]")
+            pending.append(node.slice)  # type: ignore
+            pending.append(node.value)  # type: ignore
+        elif node_type is ast.Tuple or node_type is ast.List:
+            key.append((node_type, len(node.elts)))  # type: ignore
+            pending.extend(reversed(node.elts))  # type: ignore
+        elif node_type is ast.BinOp:
+            key.append(type(node.op))  # type: ignore
+            pending.append(node.right)  # type: ignore
+            pending.append(node.left)  # type: ignore
+        elif node_type is ast.Constant:
+            key.append(("const", type(node.value), node.value, node.kind))  # type: ignore
+        elif node_type is _INDEX:
+            pending.append(node.value)  # type: ignore
+        else:
+            key.append(("dump", ast.dump(node)))
+    return tuple(key)
+
+
+class _Unsupported(Exception):
+    pass
+
+
+# Node types that need no parentheses as the value of an attribute or a
+# subscript.
+_PRIMARY_TYPES = (ast.Name, ast.Attribute, ast.Subscript)
+
+
+def _constant_text(value: typing.Any) -> str:
+    if value is None or value is True or value is False or type(value) is int:
+        return repr(value)
+    elif value is Ellipsis:
+        return "..."
+    elif type(value) is str and value.isprintable() and "\\" not in value:
+        # The first quote type not found in the string, like ast.unparse().
+        if "'" not in value:
+            return f"'{value}'"
+        elif '"' not in value:
+            return f'"{value}"'
+    raise _Unsupported
+
+
+def render_annotation(node: ast.AST) -> str:
+    """Render a type expression to source text, as ast.unparse() would.
+
+    Names, attributes, subscripts, tuples, lists, '|' unions and simple
+    constants are rendered directly, which is much cheaper than going through
+    ast.unparse(). Anything else falls back to it. The direct rendering uses
+    an explicit stack, so deeply nested unions don't exhaust the recursion
+    limit.
+    """
+    parts: list[str] = []
+    pending: list[typing.Union[ast.AST, str]] = [node]
+    try:
+        while pending:
+            item = pending.pop()
+            item_type = type(item)
+            if item_type is str:
+                parts.append(item)  # type: ignore
+            elif item_type is ast.Name:
+                parts.append(item.id)  # type: ignore
+            elif item_type is ast.Attribute:
+                if not isinstance(item.value, _PRIMARY_TYPES):  # type: ignore
+                    raise _Unsupported
+                pending.append("." + item.attr)  # type: ignore
+                pending.append(item.value)  # type: ignore
+            elif item_type is ast.Subscript:
+                if not isinstance(item.value, _PRIMARY_TYPES):  # type: ignore
+                    raise _Unsupported
+                pending.append("]")
+                slice_node = item.slice  # type: ignore
+                if type(slice_node) is _INDEX:
+                    slice_node = slice_node.value  # type: ignore
+                if type(slice_node) is ast.Tuple and len(slice_node.elts) == 1:
+                    raise _Unsupported
+                elif type(slice_node) is ast.Tuple and slice_node.elts:
+                    _push_elements(pending, slice_node.elts)
+                else:
+                    pending.append(slice_node)
+                pending.append("[")
+                pending.append(item.value)  # type: ignore
+            elif item_type is ast.Tuple:
+                elts = item.elts  # type: ignore
+                pending.append(",)" if len(elts) == 1 else ")")
+                _push_elements(pending, elts)
+                pending.append("(")
+            elif item_type is ast.List:
+                pending.append("]")
+                _push_elements(pending, item.elts)  # type: ignore
+                pending.append("[")
+            elif item_type is ast.BinOp and type(item.op) is ast.BitOr:  # type: ignore
+                # '|' is left-associative, a union on the right needs brackets.
+                right = item.right  # type: ignore
+                if type(right) is ast.BinOp:
+                    pending.extend((")", right, "("))
+                else:
+                    pending.append(right)
+                pending.append(" | ")
+                pending.append(item.left)  # type: ignore
+            elif item_type is ast.Constant:
+                if item.kind is not None:  # type: ignore
+                    raise _Unsupported
+                parts.append(_constant_text(item.value))  # type: ignore
+            else:
+                raise _Unsupported
+    except _Unsupported:
+        return unparse(node).strip()
+
+    return "".join(parts)
+
+
+def _push_elements(
+    pending: list[typing.Union[ast.AST, str]], elements: list[ast.expr]
+) -> None:
+    for index in range(len(elements) - 1, -1, -1):
+        element = elements[index]
+        if type(element) is ast.Starred:
+            raise _Unsupported
+        pending.append(element)
+        if index:
+            pending.append(", ")
+
+
+class AnnotationCache:
+    """Bounded LRU cache of rendered annotations.
+
+    Annotations are keyed by their structure, so the same annotation found in
+    different places or files is rendered only once. The cache is thread-safe
+    and can be shared by all generators of a batch run.
+
+    Rendered annotations are interned, so an annotation rendered again after
+    being evicted is still stored once in the stubs that are kept.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._rendered: OrderedDict[typing.Hashable, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, node: ast.AST) -> str:
+        """Return the source text of an annotation node."""
+        key = annotation_key(node)
+        with self._lock:
+            rendered = self._rendered.get(key)
+            if rendered is not None:
+                self._rendered.move_to_end(key)
+                self.hits += 1
+                return rendered
+            self.misses += 1
+
+        rendered = sys.intern(render_annotation(node))
+        with self._lock:
+            self._rendered[key] = rendered
+            if len(self._rendered) > self.maxsize:
+                self._rendered.popitem(last=False)
+        return rendered
+
+    def clear(self) -> None:
+        """Drop all cached annotations and reset the counters."""
+        with self._lock:
+            self._rendered.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._rendered)
@@ -0,0 +1,148 @@
+"""Generate stub files for many modules in one run."""
+
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import sys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+from .annotation import AnnotationCache
+from .preprocess import scan_trivial_source
+from .stubgen import (
+    SyntaxErrorSpan,
+    generate_budgeted_stub,
+    generate_stub_from_source,
+    map_source,
+)
+
+
+class BatchReport:
+    """Counts of the files handled by generate_stubs().
+
+    short_circuited counts the files that could only contribute imports to
+    their stub, which were not parsed in full. degraded lists the source
+    paths of the files that went over budget and got a degraded stub.
+    syntax_errors maps the source paths of files with syntax errors to the
+    spans left out of their stub, when recovering from them.
+    """
+
+    __slots__ = ("files", "short_circuited", "degraded", "syntax_errors")
+
+    def __init__(self) -> None:
+        self.files = 0
+        self.short_circuited = 0
+        self.degraded: list[str] = []
+        self.syntax_errors: dict[str, list[SyntaxErrorSpan]] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"BatchReport(files={self.files}, "
+            f"short_circuited={self.short_circuited}, "
+            f"degraded={self.degraded!r}, "
+            f"syntax_errors={self.syntax_errors!r})"
+        )
+
+
+def _generate_job(
+    job: typing.Tuple[str, str],
+    annotation_cache: AnnotationCache,
+    node_budget: typing.Optional[int],
+    time_budget: typing.Optional[float],
+    recover: bool,
+) -> typing.Tuple[str, bool, bool, typing.Optional[list[SyntaxErrorSpan]]]:
+    source_file_path, output_file_path = job
+    degraded = False
+    syntax_errors: typing.Optional[list[SyntaxErrorSpan]] = [] if recover else None
+    with map_source(source_file_path) as source_code:
+        imports = scan_trivial_source(source_code)
+        if imports is not None:
+            source_code = imports
+        if node_budget is None and time_budget is None:
+            generate_stub_from_source(
+                source_code,
+                output_file_path,
+                annotation_cache=annotation_cache,
+                syntax_errors=syntax_errors,
+            )
+        else:
+            stub, degraded = generate_budgeted_stub(
+                source_code,
+                node_budget,
+                time_budget,
+                annotation_cache,
+                syntax_errors=syntax_errors,
+            )
+            with open(output_file_path, "w") as output_file:
+                output_file.write(stub)
+    return output_file_path, imports is not None, degraded, syntax_errors
+
+
+def _is_gil_enabled() -> bool:
+    # Python 3.13 and later tell, older versions always have the GIL.
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def generate_stubs(
+    jobs: typing.Iterable[typing.Tuple[str, str]],
+    max_workers: typing.Optional[int] = None,
+    annotation_cache: typing.Optional[AnnotationCache] = None,
+    report: typing.Optional[BatchReport] = None,
+    node_budget: typing.Optional[int] = None,
+    time_budget: typing.Optional[float] = None,
+    recover: bool = False,
+) -> list[str]:
+    """Generate a stub for every (source path, output path) pair.
+
+    With max_workers of 1 the files are processed serially, otherwise they are
+    spread over a thread pool. The threads only run the generator in parallel
+    on free-threaded CPython builds (3.13t and later), with the GIL enabled the
+    pool merely overlaps file I/O and is usually slower than a serial run. So
+    max_workers None means a pool of the default size on free-threaded builds
+    and a serial run otherwise.
+
+    All files share one annotation cache, a new one unless given. Counts of
+    the run are added to report if given.
+
+    node_budget and time_budget apply to every file, see
+    generate_budgeted_stub(). A file going over them gets a degraded stub
+    and is listed in the report, the batch carries on. With recover, files
+    with syntax errors get the stub of the top-level statements that parse
+    instead of failing the run, see parse_source(), and the spans left out
+    are listed in the report.
+
+    Returns the written output paths in the order of the jobs.
+    """
+    # Paired with the results to report the degraded files.
+    jobs = list(jobs)
+    if annotation_cache is None:
+        annotation_cache = AnnotationCache()
+    generate_job = functools.partial(
+        _generate_job,
+        annotation_cache=annotation_cache,
+        node_budget=node_budget,
+        time_budget=time_budget,
+        recover=recover,
+    )
+
+    if max_workers is None and _is_gil_enabled():
+        max_workers = 1
+
+    if max_workers == 1:
+        results = [generate_job(job) for job in jobs]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(generate_job, jobs))
+
+    if report is not None:
+        report.files += len(results)
+        for (source_file_path, _), result in zip(jobs, results):
+            _, short_circuited, degraded, syntax_errors = result
+            report.short_circuited += short_circuited
+            if degraded:
+                report.degraded.append(source_file_path)
+            if syntax_errors:
+                report.syntax_errors[source_file_path] = syntax_errors
+    return [result[0] for result in results]
@@ -0,0 +1,414 @@
+"""Compact intermediate representation of a stub and its .pyi renderer.
+
+StubGenerator records declarations as the small __slots__ classes below
+instead of formatted strings. Rendering is a separate pass over the
+records, so the text only exists while it is being written out.
+"""
+
+from __future__ import annotations
+import operator
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+
+class ArgumentStub:
+    """A function parameter with its rendered annotation."""
+
+    __slots__ = ("name", "annotation")
+
+    def __init__(self, name: str, annotation: str) -> None:
+        self.name = name
+        self.annotation = annotation
+
+
+class FunctionStub:
+    """A function or method.
+
+    decorator is "classmethod", "staticmethod" or None for anything else.
+    """
+
+    __slots__ = ("name", "arguments", "returns", "decorator")
+
+    def __init__(
+        self,
+        name: str,
+        arguments: tuple[ArgumentStub, ...],
+        returns: str,
+        decorator: typing.Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.arguments = arguments
+        self.returns = returns
+        self.decorator = decorator
+
+
+class VariableStub:
+    """A variable, rendered as 'name[: annotation][ = value]'.
+
+    spaced adds a blank line after the declaration.
+    """
+
+    __slots__ = ("name", "annotation", "value", "spaced")
+
+    def __init__(
+        self,
+        name: str,
+        annotation: typing.Optional[str] = None,
+        value: typing.Optional[str] = None,
+        spaced: bool = False,
+    ) -> None:
+        self.name = name
+        self.annotation = annotation
+        self.value = value
+        self.spaced = spaced
+
+
+class ClassStub:
+    """A class with its nested classes and members.
+
+    kind is "TypedDict", "Exception" or "NamedTuple" for the layout of these
+    special forms, or None for a regular class. fields are the keys of a
+    TypedDict.
+    """
+
+    __slots__ = (
+        "name",
+        "kind",
+        "bases",
+        "is_dataclass",
+        "fields",
+        "classes",
+        "members",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        kind: typing.Optional[str] = None,
+        bases: typing.Optional[list[str]] = None,
+        is_dataclass: bool = False,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.bases = bases if bases is not None else []
+        self.is_dataclass = is_dataclass
+        self.fields: list[VariableStub] = []
+        self.classes: list[ClassStub] = []
+        self.members: list[typing.Union[FunctionStub, VariableStub]] = []
+
+
+class ConditionalStub:
+    """Declarations under an 'if sys.version_info <operator> <version>:'.
+
+    Rendered for a target version, only the selected branch is kept,
+    otherwise both are. The imports of each branch are kept apart from
+    those of the module, in body_imports and orelse_imports.
+    """
+
+    __slots__ = (
+        "operator",
+        "version",
+        "body",
+        "orelse",
+        "body_imports",
+        "orelse_imports",
+    )
+
+    def __init__(self, operator: str, version: tuple[int, ...]) -> None:
+        self.operator = operator
+        self.version = version
+        self.body: list[Statement] = []
+        self.orelse: list[Statement] = []
+        self.body_imports = ImportStub()
+        self.orelse_imports = ImportStub()
+
+
+if TYPE_CHECKING:
+    Statement = typing.Union[ClassStub, ConditionalStub, FunctionStub, VariableStub]
+
+_VERSION_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# Python version that added a typing_extensions name to typing.
+TYPING_ADDED = {
+    "Final": (3, 8),
+    "Literal": (3, 8),
+    "Protocol": (3, 8),
+    "TypedDict": (3, 8),
+    "runtime_checkable": (3, 8),
+    "Annotated": (3, 9),
+    "Concatenate": (3, 10),
+    "ParamSpec": (3, 10),
+    "TypeAlias": (3, 10),
+    "TypeGuard": (3, 10),
+    "LiteralString": (3, 11),
+    "Never": (3, 11),
+    "NotRequired": (3, 11),
+    "Required": (3, 11),
+    "Self": (3, 11),
+    "TypeVarTuple": (3, 11),
+    "Unpack": (3, 11),
+    "assert_never": (3, 11),
+    "assert_type": (3, 11),
+    "reveal_type": (3, 11),
+    "TypeAliasType": (3, 12),
+    "override": (3, 12),
+    "ReadOnly": (3, 13),
+    "TypeIs": (3, 13),
+}
+
+
+class RenderTarget:
+    """A variant of the stub to render.
+
+    version selects the branches of sys.version_info tests and, with
+    typing_module "typing", the names imported from typing rather than
+    typing_extensions; None keeps both branches and assumes the newest
+    typing. typing_module "typing_extensions" imports every typing name from
+    typing_extensions instead. None for both renders the stub as collected.
+    """
+
+    __slots__ = ("version", "typing_module")
+
+    def __init__(
+        self,
+        version: typing.Optional[tuple[int, ...]] = None,
+        typing_module: typing.Optional[str] = None,
+    ) -> None:
+        if typing_module not in (None, "typing", "typing_extensions"):
+            raise ValueError(f"Unknown typing module {typing_module!r}")
+        self.version = version
+        self.typing_module = typing_module
+
+    def __repr__(self) -> str:
+        return (
+            f"RenderTarget(version={self.version!r}, "
+            f"typing_module={self.typing_module!r})"
+        )
+
+    def in_typing(self, name: str) -> bool:
+        """Check if typing has a typing_extensions name in the target version."""
+        added = TYPING_ADDED.get(name)
+        return added is not None and (self.version is None or self.version >= added)
+
+    def selects(self, record: ConditionalStub) -> typing.Optional[bool]:
+        """Tell which branch of a version test applies, None for both."""
+        if self.version is None:
+            return None
+        return _VERSION_OPERATORS[record.operator](self.version, record.version)
+
+
+DEFAULT_TARGET = RenderTarget()
+
+
+class ImportStub:
+    """The imports of a module or of a version test branch.
+
+    from_imports maps modules to the names imported from them, imports holds
+    complete import lines. conditions are the version tests nested here with
+    imports of their own.
+    """
+
+    __slots__ = ("from_imports", "imports", "conditions")
+
+    def __init__(self) -> None:
+        self.from_imports: dict[str, set[str]] = {}
+        self.imports: set[str] = set()
+        self.conditions: list[ConditionalStub] = []
+
+    def update_imports(self, other: ImportStub) -> None:
+        """Merge the imports of other, not those of its version tests."""
+        for module, names in other.from_imports.items():
+            if module not in self.from_imports:
+                self.from_imports[module] = set()
+            self.from_imports[module].update(names)
+        self.imports.update(other.imports)
+
+
+class ModuleStub(ImportStub):
+    """The imports and top-level declarations of a module stub."""
+
+    __slots__ = ("body",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.body: list[Statement] = []
+
+    def update(self, other: ModuleStub) -> None:
+        """Append the declarations of other and merge its imports."""
+        self.update_imports(other)
+        self.conditions.extend(other.conditions)
+        self.body.extend(other.body)
+
+
+def selected_imports(
+    module: ImportStub, target: RenderTarget = DEFAULT_TARGET
+) -> ImportStub:
+    """Return the imports of a module with those of the branches target keeps."""
+    if not module.conditions:
+        return module
+    imports = ImportStub()
+    imports.update_imports(module)
+    pending = list(module.conditions)
+    while pending:
+        record = pending.pop()
+        selected = target.selects(record)
+        if selected is None:
+            branches = (record.body_imports, record.orelse_imports)
+        else:
+            branches = (record.body_imports if selected else record.orelse_imports,)
+        for branch in branches:
+            imports.update_imports(branch)
+            pending.extend(branch.conditions)
+    return imports
+
+
+def render_imports(
+    module: ImportStub, target: RenderTarget = DEFAULT_TARGET
+) -> str:
+    """Render the imports header of a module stub."""
+    module = selected_imports(module, target)
+    imports = []
+    imports.append("from __future__ import annotations\n")
+
+    from_imports = module.from_imports
+    if target.typing_module is not None:
+        from_imports = _retarget_typing(from_imports, target)
+
+    for name, names in sorted(from_imports.items()):
+        if names:
+            imports.append(f"from {name} import {', '.join(sorted(names))}\n")
+
+    for imp in sorted(module.imports):
+        if imp != "from __future__ import annotations":
+            imports.append(f"{imp}\n")
+
+    return "".join(imports) + "\n" if imports else ""
+
+
+def _retarget_typing(
+    from_imports: dict[str, set[str]], target: RenderTarget
+) -> dict[str, set[str]]:
+    from_imports = {module: set(names) for module, names in from_imports.items()}
+    if target.typing_module == "typing_extensions":
+        source, destination = "typing", "typing_extensions"
+        moved = set(from_imports.get(source, ()))
+    else:
+        source, destination = "typing_extensions", "typing"
+        moved = {
+            name
+            for name in from_imports.get(source, ())
+            if target.in_typing(name)
+        }
+
+    if moved:
+        from_imports[source] -= moved
+        if destination not in from_imports:
+            from_imports[destination] = set()
+        from_imports[destination].update(moved)
+    return from_imports
+
+
+def render_module(module: ModuleStub, target: RenderTarget = DEFAULT_TARGET) -> str:
+    """Render a module stub to .pyi text."""
+    return render_imports(module, target) + "".join(
+        fragment
+        for record in module.body
+        for fragment in iter_fragments(record, target)
+    )
+
+
+def iter_fragments(
+    record: Statement, target: RenderTarget = DEFAULT_TARGET
+) -> typing.Iterator[str]:
+    """Yield the text of a top-level record piece by piece.
+
+    Nested classes are rendered from an explicit stack, like they are
+    collected, so their depth is not bound by the recursion limit.
+    """
+    pending: list[typing.Union[str, tuple[Statement, int]]] = [(record, 0)]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, str):
+            yield item
+            continue
+
+        record, level = item
+        indent = "    " * level
+        if isinstance(record, ClassStub):
+            yield _class_header(record, indent)
+
+            tail: list[typing.Union[str, tuple[Statement, int]]] = []
+            if record.classes or record.members:
+                tail.append("\n")
+            tail.extend((nested, level + 1) for nested in record.classes)
+            if record.classes and record.members:
+                tail.append("\n")
+            tail.extend((member, level + 1) for member in record.members)
+            if not level:
+                tail.append("\n")
+            pending.extend(reversed(tail))
+        elif isinstance(record, ConditionalStub):
+            selected = target.selects(record)
+            if selected is None:
+                block = record.body + record.orelse
+            else:
+                block = record.body if selected else record.orelse
+            pending.extend((nested, level) for nested in reversed(block))
+        elif isinstance(record, FunctionStub):
+            yield _function(record, indent, is_method=bool(level))
+        else:
+            yield indent + _variable(record)
+
+
+def _class_header(record: ClassStub, indent: str) -> str:
+    if record.kind == "TypedDict":
+        return f"{indent}class {record.name}(TypedDict):\n" + "".join(
+            f"{indent}    {_variable(field)}" for field in record.fields
+        )
+    elif record.kind == "Exception":
+        if not any(isinstance(member, FunctionStub) for member in record.members):
+            return f"{indent}class {record.name}(Exception): ..."
+        return f"{indent}class {record.name}(Exception):"
+    elif record.kind == "NamedTuple":
+        return f"{indent}class {record.name}(NamedTuple):\n"
+
+    header = f"{indent}@dataclass\n" if record.is_dataclass else ""
+    header += f"{indent}class {record.name}"
+    if record.bases:
+        header += f"({', '.join(record.bases)})"
+    return header + ":"
+
+
+def _function(record: FunctionStub, indent: str, is_method: bool) -> str:
+    arguments = [f"{arg.name}: {arg.annotation}" for arg in record.arguments]
+    if not is_method:
+        return (
+            f"def {record.name}({', '.join(arguments)}) -> {record.returns}:"
+            "\n    ...\n\n"
+        )
+
+    signature = f"({', '.join(arguments)}) -> {record.returns}: ...\n"
+    if record.decorator == "classmethod":
+        signature = f"(cls, {', '.join(arguments[1:])}) -> {record.returns}: ...\n"
+        return f"{indent}@classmethod\n{indent}def {record.name}{signature}"
+    elif record.decorator == "staticmethod":
+        return f"{indent}@staticmethod\n{indent}def {record.name}{signature}"
+    return f"{indent}def {record.name}{signature}"
+
+
+def _variable(record: VariableStub) -> str:
+    text = record.name
+    if record.annotation is not None:
+        text += f": {record.annotation}"
+    if record.value is not None:
+        text += f" = {record.value}"
+    return text + ("\n\n" if record.spaced else "\n")
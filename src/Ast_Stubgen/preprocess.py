@@ -0,0 +1,319 @@
+"""Source level transformations applied before parsing."""
+
+from __future__ import annotations
+import io
+import re
+import tokenize
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import mmap
+    import typing
+
+    # Source given as undecoded bytes, ast.parse() detects the PEP 263
+    # encoding.
+    SourceBuffer = typing.Union[bytes, bytearray, memoryview, mmap.mmap]
+
+_OPENING_BRACKETS = frozenset("([{")
+_CLOSING_BRACKETS = frozenset(")]}")
+_INSIGNIFICANT_TOKENS = frozenset(
+    (tokenize.NL, tokenize.COMMENT, tokenize.INDENT, tokenize.DEDENT)
+)
+
+
+def _find_function_bodies(
+    tokens: typing.Iterator[tokenize.TokenInfo],
+) -> typing.Iterator[typing.Tuple[int, int, str]]:
+    """Yield (first row, last row, indentation) of every indented def body.
+
+    Only plain 'def' bodies are found, those of 'async def' and bodies
+    written on the same line as the signature are kept.
+    """
+    previous = ""
+    for token in tokens:
+        if token.type != tokenize.NAME or token.string != "def" or previous == "async":
+            if token.type not in _INSIGNIFICANT_TOKENS:
+                previous = token.string
+            continue
+
+        # Skip the signature, its colon is the first one outside of brackets.
+        depth = 0
+        for token in tokens:
+            if token.type != tokenize.OP:
+                continue
+            if token.string in _OPENING_BRACKETS:
+                depth += 1
+            elif token.string in _CLOSING_BRACKETS:
+                depth -= 1
+            elif token.string == ":" and depth == 0:
+                break
+
+        # Not next(tokens), a StopIteration would become a RuntimeError here.
+        token = next(tokens, None)
+        while token is not None and token.type == tokenize.COMMENT:
+            token = next(tokens, None)
+        if token is None:
+            return
+        previous = token.string
+        if token.type != tokenize.NEWLINE:
+            continue
+
+        while token is not None and token.type in (
+            tokenize.NEWLINE,
+            tokenize.NL,
+            tokenize.COMMENT,
+        ):
+            token = next(tokens, None)
+        if token is None:
+            return
+        if token.type != tokenize.INDENT:
+            continue
+
+        first_row = token.start[0]
+        indentation = token.string
+        level = 1
+        for token in tokens:
+            if token.type == tokenize.INDENT:
+                level += 1
+            elif token.type == tokenize.DEDENT:
+                level -= 1
+                if level == 0:
+                    break
+
+        # The closing DEDENT is located at the next statement.
+        yield first_row, token.start[0] - 1, indentation
+
+
+def elide_function_bodies(source_code: str) -> str:
+    """Replace the bodies of 'def' statements by '...'.
+
+    Stubs only need signatures, and most nodes of a module are usually found
+    in function bodies, so dropping them makes parsing cheaper. Line numbers
+    are preserved. Sources that fail to tokenize are returned unchanged, for
+    parsing to report the error.
+
+    Tokenizing is done in pure Python before 3.12, there the saving is in the
+    memory used by the tree rather than in time.
+    """
+    tokens = tokenize.generate_tokens(io.StringIO(source_code).readline)
+    try:
+        bodies = list(_find_function_bodies(tokens))
+    except (tokenize.TokenError, SyntaxError):
+        return source_code
+
+    if not bodies:
+        return source_code
+
+    # Not str.splitlines(), its rows must be those of the tokenizer.
+    lines = io.StringIO(source_code).readlines()
+    for first_row, last_row, indentation in bodies:
+        lines[first_row - 1] = f"{indentation}...\n"
+        for row in range(first_row, last_row):
+            lines[row] = "\n"
+
+    return "".join(lines)
+
+
+# Keywords continuing the compound statement of the previous logical line.
+_CONTINUATION_KEYWORDS = frozenset(("else", "elif", "except", "finally"))
+
+
+def iter_top_level_statements(
+    readline: typing.Callable[[], str],
+) -> typing.Iterator[typing.Tuple[int, str]]:
+    """Split a module into its top-level statements.
+
+    Yields (first line number, source) pairs, decorators stay with their
+    definition. Comments and blank lines between two statements end the
+    source of the first one, only those before the first statement of the
+    module lead its source. Lines are pulled from readline as needed, so only
+    the current statement is held in memory.
+    """
+    lines: list[str] = []
+    first_row = 1
+    has_statement = False
+
+    def recording_readline() -> str:
+        line = readline()
+        lines.append(line)
+        return line
+
+    depth = 0
+    at_line_start = True
+    after_decorator = False
+    for token in tokenize.generate_tokens(recording_readline):
+        token_type = token.type
+        if token_type == tokenize.INDENT:
+            depth += 1
+        elif token_type == tokenize.DEDENT:
+            depth -= 1
+        elif token_type == tokenize.NEWLINE:
+            at_line_start = True
+        elif token_type == tokenize.ENDMARKER:
+            break
+        elif token_type not in (tokenize.NL, tokenize.COMMENT) and at_line_start:
+            at_line_start = False
+            if depth != 0:
+                continue
+
+            if (
+                has_statement
+                and not after_decorator
+                and token.string not in _CONTINUATION_KEYWORDS
+            ):
+                row = token.start[0]
+                yield first_row, "".join(lines[: row - first_row])
+                del lines[: row - first_row]
+                first_row = row
+
+            has_statement = True
+            after_decorator = token.string == "@"
+
+    if has_statement:
+        yield first_row, "".join(lines)
+
+
+# Ends of the lines counted by the parser, after a "\r" not followed by
+# "\n" or after a "\n".
+_LINE_END = re.compile(r"(?<=\r)(?!\n)|(?<=\n)")
+
+
+def split_lines(source_code: str) -> list[str]:
+    """Split a source into lines, keeping their ends.
+
+    Unlike str.splitlines(), form feeds, U+2028 and the other separators
+    that are no line break to the parser stay within a line.
+    """
+    lines = _LINE_END.split(source_code)
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+_NOT_STATEMENT_START = frozenset(" \t\r\n#)]}")
+
+
+def iter_unindented_blocks(
+    lines: typing.Sequence[str], first_row: int = 1
+) -> typing.Iterator[typing.Tuple[int, str]]:
+    """Split lines into blocks starting at unindented lines.
+
+    A rough iter_top_level_statements() for sources that fail to tokenize.
+    Yields (first line number, source) pairs, lines[0] being line first_row.
+    Decorators and compound statement continuations stay with the block
+    before, but lines of multi-line strings in column 0 start new blocks.
+    """
+    block: list[str] = []
+    block_row = first_row
+    has_statement = False
+    after_decorator = False
+    for row, line in enumerate(lines, first_row):
+        block.append(line)
+        if line[:1] in _NOT_STATEMENT_START or not line.strip():
+            continue
+
+        if (
+            has_statement
+            and not after_decorator
+            and line.split(None, 1)[0].rstrip(":") not in _CONTINUATION_KEYWORDS
+        ):
+            block.pop()
+            yield block_row, "".join(block)
+            block = [line]
+            block_row = row
+        has_statement = True
+        after_decorator = line.startswith("@")
+
+    if block:
+        yield block_row, "".join(block)
+
+
+_LINE = re.compile(rb".*\n?")
+_IMPORT = re.compile(rb"(?:import|from)\s")
+_MAIN_BLOCK = re.compile(rb"""if\s+__name__\s*==\s*(["'])__main__\1\s*:""")
+_MAIN_BLOCK_CONTINUATION = re.compile(rb"(?:else|elif)\b")
+_TRIPLE_QUOTES = (b'"""', b"'''")
+
+
+def scan_trivial_source(source: SourceBuffer) -> typing.Optional[bytes]:
+    """Return the imports of a module that declares nothing else, else None.
+
+    Such modules, scripts and test modules mostly, only hold imports, a
+    docstring, string expressions, comments and '__main__' blocks. Their stub
+    only has the imports, so just those need to be parsed. The lines are
+    matched as bytes without tokenizing, unclear cases like a triple-quoted
+    string past the docstring are reported as declaring something. Syntax
+    errors outside of the imports go unnoticed.
+    """
+    imports = []
+    # Closing quotes while in the docstring.
+    docstring_end = None
+    has_statement = False
+    # Brackets opened by the current import statement, -1 outside of one.
+    import_depth = -1
+    in_main_block = False
+
+    for lineno, match in enumerate(_LINE.finditer(source), 1):
+        line = match.group()
+        if not line:
+            break
+
+        if docstring_end is not None:
+            end = line.find(docstring_end)
+            if end != -1:
+                if line[end + 3 :].strip():
+                    return None
+                docstring_end = None
+            continue
+
+        code = line.split(b"#", 1)[0].strip()
+        if import_depth < 0:
+            if not code:
+                # Keep a PEP 263 encoding declaration in effect.
+                if lineno <= 2 and line.startswith(b"#"):
+                    imports.append(line)
+                continue
+            elif line.startswith(_TRIPLE_QUOTES) and not has_statement:
+                quotes = line[:3]
+                end = line.find(quotes, 3)
+                if end == -1:
+                    docstring_end = quotes
+                elif line[end + 3 :].strip():
+                    return None
+                has_statement = True
+                continue
+            elif any(quotes in line for quotes in _TRIPLE_QUOTES) or (
+                code.endswith(b"\\") and not _IMPORT.match(line)
+            ):
+                # Lines of the string or of the continued line could start at
+                # column 0 and look like statements.
+                return None
+            elif line[:1] in b" \t":
+                if in_main_block:
+                    continue
+                return None
+
+            has_statement = True
+            if _MAIN_BLOCK.match(line) or (
+                in_main_block and _MAIN_BLOCK_CONTINUATION.match(line)
+            ):
+                in_main_block = True
+                continue
+            in_main_block = False
+            if line.startswith((b'"', b"'")) and b";" not in line:
+                continue
+            elif not _IMPORT.match(line):
+                return None
+            import_depth = 0
+
+        # A line of an import statement, these hold no strings.
+        if not line.isascii() or b";" in code:
+            return None
+        imports.append(line)
+        import_depth += code.count(b"(") - code.count(b")")
+        if import_depth == 0 and not code.endswith(b"\\"):
+            import_depth = -1
+
+    if docstring_end is not None or import_depth >= 0:
+        return None
+    return b"".join(imports)
@@ -1,530 +1,1626 @@
 from __future__ import annotations
 import ast
+import contextlib
+import functools
+import io
+import itertools
+import mmap
+import os
+import stat
 import sys
-import typing
-
-if sys.version_info < (3, 9):
-    from astunparser.astunparser import unparse
+import time
+import tokenize
+
+from .annotation import AnnotationCache
+from .ir import (
+    ArgumentStub,
+    ClassStub,
+    ConditionalStub,
+    FunctionStub,
+    ImportStub,
+    ModuleStub,
+    RenderTarget,
+    VariableStub,
+    iter_fragments,
+    render_imports,
+    render_module,
+)
+from .preprocess import (
+    elide_function_bodies,
+    iter_top_level_statements,
+    iter_unindented_blocks,
+    scan_trivial_source,
+    split_lines,
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    import typing
+
+    from .ir import Statement
+    from .preprocess import SourceBuffer
+
+    Source = typing.Union[str, SourceBuffer]
+    # Work of the explicit visiting stack: nodes to visit or callables to call.
+    PendingItem = typing.Union[ast.AST, typing.Callable[[], None]]
+    # Completes the stub of a class given its AnnAssign and Assign statements.
+    ClassForm = typing.Callable[
+        ["StubGenerator", ast.ClassDef, ClassStub, list[ast.stmt]], None
+    ]
+    # Adds the stub of a variable assigned the result of a call.
+    CallForm = typing.Callable[["StubGenerator", str, ast.Call], None]
+
+if sys.version_info >= (3, 9):
+    from ast import unparse
+
+    _INDEX = None
+else:
+    from ._unparse import _INDEX, unparse
+
+
+def is_main_block(node: ast.AST) -> bool:
+    """Check if a node is an 'if __name__ == "__main__":' block."""
+    if not isinstance(node, ast.If):
+        return False
+
+    test = node.test
+    return (
+        isinstance(test, ast.Compare)
+        and isinstance(test.left, ast.Name)
+        and test.left.id == "__name__"
+        and len(test.ops) == 1
+        and isinstance(test.ops[0], ast.Eq)
+        and len(test.comparators) == 1
+        and isinstance(test.comparators[0], ast.Constant)
+        and test.comparators[0].value == "__main__"
+    )
 
-    ast.unparse = unparse
 
+def decode_source(source: Source) -> str:
+    """Return source text, decoding a buffer with its PEP 263 encoding."""
+    if isinstance(source, str):
+        return source
+    source_bytes = bytes(source)
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(source_bytes).readline)
+    return source_bytes.decode(encoding)
+
+
+@contextlib.contextmanager
+def map_source(source_file_path: str) -> typing.Iterator[SourceBuffer]:
+    """Map a source file read-only into memory.
+
+    Empty files can't be mapped, nor can pipes and other files that are not
+    regular, or files on some file systems. These are read into bytes
+    instead.
+    """
+    with open(source_file_path, "rb") as source_file:
+        status = os.fstat(source_file.fileno())
+        source = None
+        if stat.S_ISREG(status.st_mode) and status.st_size:
+            try:
+                source = mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except OSError:
+                pass
+        if source is None:
+            yield source_file.read()
+            return
+        with source:
+            yield source
+
+
+# Characters of stub output kept in memory before spilling to a temporary
+# file while streaming.
+SPOOL_SIZE = 1024 * 1024
+
+
+class _SpooledStubs:
+    """Append-only replacement for the list of top-level stub records.
+
+    Records are rendered as they are appended and the text is spilled to a
+    temporary file once it exceeds max_size characters, which bounds the
+    memory held for the output while streaming.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.buffer: typing.TextIO = io.StringIO(newline="")
+        self.spilled = False
+
+    def append(self, record: Statement) -> None:
+        self.buffer.writelines(iter_fragments(record))
+        if not self.spilled and self.buffer.tell() > self.max_size:
+            self.spill()
+
+    def spill(self) -> None:
+        # Most stubs fit in memory, tempfile is only imported for the others.
+        import tempfile
+
+        text = self.buffer.getvalue()  # type: ignore
+        self.buffer = tempfile.TemporaryFile(mode="w+", encoding="utf-8", newline="")
+        self.buffer.write(text)
+        self.spilled = True
+
+    def lines(self) -> typing.Iterator[str]:
+        try:
+            self.buffer.seek(0)
+            yield from self.buffer
+        finally:
+            self.buffer.close()
+
+
+def split_statements(
+    statements: list[ast.stmt], parts: int
+) -> list[list[ast.stmt]]:
+    """Split statements into at most parts contiguous runs of similar size.
+
+    The size of a statement is estimated from the lines it spans.
+    """
+    weights = [
+        (getattr(statement, "end_lineno", None) or statement.lineno)
+        - statement.lineno
+        + 1
+        for statement in statements
+    ]
+    target = sum(weights) / max(parts, 1)
+
+    runs: list[list[ast.stmt]] = [[]]
+    run_weight = 0
+    for statement, weight in zip(statements, weights):
+        if run_weight >= target and len(runs) < parts:
+            runs.append([])
+            run_weight = 0
+        runs[-1].append(statement)
+        run_weight += weight
+
+    return [run for run in runs if run]
+
+
+def _collect_statements(
+    generator_class: typing.Type[StubGenerator],
+    settings: dict[str, typing.Any],
+    statements: list[ast.stmt],
+) -> tuple[ModuleStub, set[str]]:
+    stub_generator = generator_class(**settings)
+    stub_generator.collect(ast.Module(body=statements, type_ignores=[]))
+    return stub_generator.module, stub_generator.typevars
+
+
+class BudgetExceeded(Exception):
+    """A module took more work than the budget of the generator allows."""
+
+
+def degraded_stub(tree: ast.Module) -> str:
+    """Return a stub declaring the top-level names of a module as Any.
+
+    The fallback for modules over budget. Names defined by functions,
+    classes and assignments are kept, also those in version tests, try and
+    with blocks, imports are not.
+    """
+    module = ModuleStub()
+    module.from_imports["typing"] = {"Any"}
+    names: dict[str, None] = {}
+    pending: list[ast.stmt] = list(reversed(tree.body))
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names[node.name] = None
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            # Unpacked names, in order.
+            pending_targets = list(reversed(targets))
+            while pending_targets:
+                target = pending_targets.pop()
+                if isinstance(target, ast.Name):
+                    names[target.id] = None
+                elif isinstance(target, (ast.Tuple, ast.List)):
+                    pending_targets.extend(reversed(target.elts))
+        elif isinstance(node, ast.If) and not is_main_block(node):
+            pending.extend(reversed(node.orelse))
+            pending.extend(reversed(node.body))
+        elif isinstance(node, ast.Try):
+            statements = list(node.body)
+            for handler in node.handlers:
+                statements.extend(handler.body)
+            statements.extend(node.orelse)
+            statements.extend(node.finalbody)
+            pending.extend(reversed(statements))
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            pending.extend(reversed(node.body))
+
+    module.body.extend(VariableStub(name, "Any") for name in names)
+    return render_module(module)
+
+
+# Default for the number of nodes above which module variable values are
+# replaced by their type in the stub.
+LITERAL_SIZE_LIMIT = 1000
+
+_CONTAINER_TYPES = {ast.List: "list", ast.Set: "set", ast.Tuple: "tuple"}
+
+
+def infer_literal_type(node: ast.expr) -> typing.Optional[str]:
+    """Infer the type of a literal value, None if it can't be told.
+
+    Containers get their element types if these agree, otherwise they are
+    left unparametrized.
+    """
+    if isinstance(node, ast.Constant):
+        if node.value is None:
+            return "None"
+        elif node.value is Ellipsis:
+            return None
+        return type(node.value).__name__
+    elif isinstance(node, ast.Dict):
+        if not node.keys or None in node.keys:
+            return "dict"
+        key_type = _common_literal_type(node.keys)  # type: ignore
+        value_type = _common_literal_type(node.values)
+        if key_type is None or value_type is None:
+            return "dict"
+        return f"dict[{key_type}, {value_type}]"
+    elif isinstance(node, (ast.List, ast.Set, ast.Tuple)):
+        container = _CONTAINER_TYPES[type(node)]
+        element_type = _common_literal_type(node.elts) if node.elts else None
+        if element_type is None:
+            return container
+        elif container == "tuple":
+            return f"tuple[{element_type}, ...]"
+        return f"{container}[{element_type}]"
+    return None
+
+
+def _common_literal_type(nodes: list[ast.expr]) -> typing.Optional[str]:
+    common_type = None
+    for node in nodes:
+        node_type = infer_literal_type(node)
+        if node_type is None:
+            return None
+        elif common_type is not None and node_type != common_type:
+            return None
+        common_type = node_type
+    return common_type
+
+
+_VERSION_OPERATORS = {
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.Eq: "==",
+    ast.NotEq: "!=",
+}
+
+
+def version_condition(
+    test: ast.expr,
+) -> typing.Optional[tuple[str, tuple[int, ...]]]:
+    """Return the operator and version of a sys.version_info test.
+
+    Only comparisons with a tuple of integers, like
+    'sys.version_info >= (3, 8)', are recognized, None is returned for
+    anything else.
+    """
+    if not (
+        isinstance(test, ast.Compare)
+        and len(test.ops) == 1
+        and type(test.ops[0]) in _VERSION_OPERATORS
+        and isinstance(test.comparators[0], ast.Tuple)
+    ):
+        return None
 
-class MainBlockRemover(ast.NodeTransformer):
-    """AST transformer that removes 'if __name__ == "__main__":' blocks."""
+    left = test.left
+    # sys.version_info[:2]
+    if isinstance(left, ast.Subscript) and isinstance(left.slice, ast.Slice):
+        left = left.value
+    if not (
+        isinstance(left, ast.Attribute)
+        and left.attr == "version_info"
+        and isinstance(left.value, ast.Name)
+        and left.value.id == "sys"
+    ):
+        return None
 
-    def visit_If(self, node: ast.If) -> typing.Optional[ast.AST]:
-        if (
-            isinstance(node.test, ast.Compare)
-            and isinstance(node.test.left, ast.Name)
-            and node.test.left.id == "__name__"
-            and len(node.test.ops) == 1
-            and isinstance(node.test.ops[0], ast.Eq)
-            and len(node.test.comparators) == 1
-            and isinstance(node.test.comparators[0], ast.Constant)
-            and node.test.comparators[0].value == "__main__"
-        ):
+    version = []
+    for elt in test.comparators[0].elts:
+        if not (isinstance(elt, ast.Constant) and type(elt.value) is int):
             return None
+        version.append(elt.value)
+    return _VERSION_OPERATORS[type(test.ops[0])], tuple(version)
+
+
+# Names exported by typing up to Python 3.13. Static, so that typing isn't
+# imported just to read typing.__all__.
+TYPING_NAMES = frozenset(
+    (
+        "AbstractSet",
+        "Annotated",
+        "Any",
+        "AnyStr",
+        "AsyncContextManager",
+        "AsyncGenerator",
+        "AsyncIterable",
+        "AsyncIterator",
+        "Awaitable",
+        "BinaryIO",
+        "ByteString",
+        "Callable",
+        "ChainMap",
+        "ClassVar",
+        "Collection",
+        "Concatenate",
+        "Container",
+        "ContextManager",
+        "Coroutine",
+        "Counter",
+        "DefaultDict",
+        "Deque",
+        "Dict",
+        "Final",
+        "ForwardRef",
+        "FrozenSet",
+        "Generator",
+        "Generic",
+        "Hashable",
+        "IO",
+        "ItemsView",
+        "Iterable",
+        "Iterator",
+        "KeysView",
+        "List",
+        "Literal",
+        "LiteralString",
+        "Mapping",
+        "MappingView",
+        "Match",
+        "MutableMapping",
+        "MutableSequence",
+        "MutableSet",
+        "NamedTuple",
+        "Never",
+        "NewType",
+        "NoDefault",
+        "NoReturn",
+        "NotRequired",
+        "Optional",
+        "OrderedDict",
+        "ParamSpec",
+        "ParamSpecArgs",
+        "ParamSpecKwargs",
+        "Pattern",
+        "Protocol",
+        "ReadOnly",
+        "Required",
+        "Reversible",
+        "Self",
+        "Sequence",
+        "Set",
+        "Sized",
+        "SupportsAbs",
+        "SupportsBytes",
+        "SupportsComplex",
+        "SupportsFloat",
+        "SupportsIndex",
+        "SupportsInt",
+        "SupportsRound",
+        "TYPE_CHECKING",
+        "Text",
+        "TextIO",
+        "Tuple",
+        "Type",
+        "TypeAlias",
+        "TypeAliasType",
+        "TypeGuard",
+        "TypeIs",
+        "TypeVar",
+        "TypeVarTuple",
+        "TypedDict",
+        "Union",
+        "Unpack",
+        "ValuesView",
+        "assert_never",
+        "assert_type",
+        "cast",
+        "clear_overloads",
+        "dataclass_transform",
+        "final",
+        "get_args",
+        "get_origin",
+        "get_overloads",
+        "get_protocol_members",
+        "get_type_hints",
+        "is_protocol",
+        "is_typeddict",
+        "no_type_check",
+        "no_type_check_decorator",
+        "overload",
+        "override",
+        "reveal_type",
+        "runtime_checkable",
+    )
+)
+
+
+def typed_dict_form(
+    generator: StubGenerator,
+    node: ast.ClassDef,
+    stub: ClassStub,
+    assignments: list[ast.stmt],
+) -> None:
+    """Keep the keys of a TypedDict as its fields."""
+    stub.kind = "TypedDict"
+    for child in assignments:
+        if isinstance(child, ast.AnnAssign):
+            generator.add_typed_dict_field(stub, child.target, child.annotation)
+        else:
+            for target in child.targets:  # type: ignore
+                generator.add_typed_dict_field(stub, target, child.value)  # type: ignore
+    if "typing" not in generator.imports_helper_dict:
+        generator.imports_helper_dict["typing"] = set()
+    generator.imports_helper_dict["typing"].add("TypedDict")
+
+
+def exception_form(
+    generator: StubGenerator,
+    node: ast.ClassDef,
+    stub: ClassStub,
+    assignments: list[ast.stmt],
+) -> None:
+    """Stub an exception without its bases and attributes."""
+    stub.kind = "Exception"
+
+
+def named_tuple_form(
+    generator: StubGenerator,
+    node: ast.ClassDef,
+    stub: ClassStub,
+    assignments: list[ast.stmt],
+) -> None:
+    """Stub a typing.NamedTuple class."""
+    stub.kind = "NamedTuple"
+    if "typing" not in generator.imports_helper_dict:
+        generator.imports_helper_dict["typing"] = set()
+    generator.imports_helper_dict["typing"].add("NamedTuple")
+
+
+def type_var_form(generator: StubGenerator, name: str, call: ast.Call) -> None:
+    """Copy a TypeVar definition and remember its name."""
+    if "typing" not in generator.imports_helper_dict:
+        generator.imports_helper_dict["typing"] = set()
+    generator.imports_helper_dict["typing"].add("TypeVar")
+    generator.typevars.add(name)
+    if call.args:
+        value = f"TypeVar({', '.join([unparse(arg) for arg in call.args])})"
+    else:
+        value = f'TypeVar("{name}")'
+    generator.add_statement(VariableStub(name, value=value, spaced=True))
 
-        return self.generic_visit(node)
 
+def frozenset_form(generator: StubGenerator, name: str, call: ast.Call) -> None:
+    """Copy a frozenset() definition, or give its type if it is large."""
+    if generator.is_large_value(call):
+        element_type = None
+        if len(call.args) == 1 and isinstance(
+            call.args[0], (ast.List, ast.Set, ast.Tuple)
+        ):
+            element_type = _common_literal_type(call.args[0].elts)
+        value_type = f"frozenset[{element_type}]" if element_type else "frozenset"
+        generator.add_statement(VariableStub(name, value_type))
+        return
+    value = f"frozenset({', '.join([unparse(arg).strip() for arg in call.args])})"
+    generator.add_statement(VariableStub(name, value=value))
+
+
+def namedtuple_form(generator: StubGenerator, name: str, call: ast.Call) -> None:
+    """Copy a collections.namedtuple() definition."""
+    tuple_name = unparse(call.args[0]).strip()
+    fields = ", ".join([unparse(arg).strip() for arg in call.args[1:]])
+    value = f"namedtuple({tuple_name}, {fields})"
+    generator.add_statement(VariableStub(name, value=value))
+
+
+class StubGenerator(ast.NodeVisitor):
+    """AST visitor that collects the stub of a module.
+
+    All state of a run lives on the instance and is cleared by reset(), so a
+    generator can be reused for many modules or subclassed. Instances are not
+    meant to be shared between threads, create one per thread instead.
+    """
+
+    # Node type to visitor method, see _build_dispatch_table().
+    dispatch_table: typing.ClassVar[
+        dict[type, typing.Callable[[StubGenerator, typing.Any], None]]
+    ] = {}
+
+    # Special forms: the first plain name among the bases of a class, or the
+    # name of a function whose result is assigned to a variable, to the
+    # handler writing its stub. See register_class_form() and
+    # register_call_form().
+    class_forms: typing.ClassVar[dict[str, ClassForm]] = {
+        "TypedDict": typed_dict_form,
+        "Exception": exception_form,
+        "NamedTuple": named_tuple_form,
+    }
+    call_forms: typing.ClassVar[dict[str, CallForm]] = {
+        "TypeVar": type_var_form,
+        "frozenset": frozenset_form,
+        "namedtuple": namedtuple_form,
+    }
+
+    def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._build_dispatch_table()
+        # Registering a form on a subclass leaves its parents unchanged.
+        cls.class_forms = dict(cls.class_forms)
+        cls.call_forms = dict(cls.call_forms)
+
+    @classmethod
+    def register_class_form(cls, base_name: str, handler: ClassForm) -> None:
+        """Stub the classes whose first plain base is base_name with handler.
+
+        The handler is called with the generator, the class node, its stub
+        and the AnnAssign and Assign statements of its body, once the Generic
+        base has been handled and before the members are visited. Regular
+        classes get their bases and the dataclass decorator instead.
+        """
+        cls.class_forms[base_name] = handler
+
+    @classmethod
+    def register_call_form(cls, call_name: str, handler: CallForm) -> None:
+        """Stub variables assigned the result of calling call_name with handler.
+
+        The handler is called with the generator, the variable name and the
+        call node. Results of calls without a handler are left out of the stub.
+        """
+        cls.call_forms[call_name] = handler
+
+    @classmethod
+    def _build_dispatch_table(cls) -> None:
+        """Map node types to the visit_<node type> methods of the class.
+
+        Done once per class, so visiting a node is a dictionary lookup
+        instead of building and looking up the method name every time.
+        """
+        cls.dispatch_table = {}
+        for name in dir(cls):
+            if not name.startswith("visit_"):
+                continue
+            visitor = getattr(cls, name)
+            # Skip the compatibility visitors of ast.NodeVisitor itself.
+            if visitor is getattr(ast.NodeVisitor, name, None):
+                continue
+            node_type = getattr(ast, name[len("visit_") :], None)
+            if isinstance(node_type, type) and issubclass(node_type, ast.AST):
+                cls.dispatch_table[node_type] = visitor
+
+    def __init__(
+        self,
+        annotation_cache: typing.Optional[AnnotationCache] = None,
+        literal_size_limit: typing.Optional[int] = LITERAL_SIZE_LIMIT,
+        node_budget: typing.Optional[int] = None,
+        time_budget: typing.Optional[float] = None,
+    ) -> None:
+        self.typing_imports = TYPING_NAMES
+        # Values of module variables with more nodes are not copied into the
+        # stub, None copies them regardless of their size.
+        self.literal_size_limit = literal_size_limit
+        # Limits of a run on the visited nodes and on the seconds spent, a
+        # run going over one raises BudgetExceeded. None for no limit.
+        self.node_budget = node_budget
+        self.time_budget = time_budget
+        # Survives reset(), pass the same cache to share it between generators.
+        self.annotation_cache = (
+            annotation_cache if annotation_cache is not None else AnnotationCache()
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything collected by a previous run."""
+        self.module = ModuleStub()
+        self.enter_imports(self.module)
+        # Top-level records go here, classes once all their members are in.
+        self.stubs: typing.Union[list[Statement], _SpooledStubs] = self.module.body
+        # Classes being visited, innermost last.
+        self.class_stack: list[ClassStub] = []
+        # Branches of the version tests being visited, innermost last.
+        self.blocks: list[list[Statement]] = []
+        self.typevars: set[str] = set()
+        self.visited_nodes = 0
+        self.deadline = (
+            time.perf_counter() + self.time_budget
+            if self.time_budget is not None
+            else None
+        )
+        self.pending: list[PendingItem] = []
+        self.draining = False
+
+    def enter_imports(self, imports: ImportStub) -> None:
+        """Record the imports found from now on in imports."""
+        self.import_stub = imports
+        # Aliases of the current imports, kept for the visitors.
+        self.imports_helper_dict = imports.from_imports
+        self.imports_output = imports.imports
+
+    @property
+    def in_class(self) -> bool:
+        return bool(self.class_stack)
+
+    def collect(self, tree: ast.Module) -> None:
+        """Visit a parsed module, adding to the state of the current run."""
+        self.visit(tree)
+
+    def generate(self, tree: ast.Module) -> str:
+        """Return the stub text for a parsed module."""
+        self.reset()
+        self.collect(tree)
+
+        return render_module(self.module)
+
+    def generate_variants(
+        self, tree: ast.Module, targets: typing.Iterable[RenderTarget]
+    ) -> list[str]:
+        """Return the stub text for a parsed module for every target.
+
+        The module is visited once, only the rendering is repeated.
+        """
+        self.reset()
+        self.collect(tree)
+
+        return [render_module(self.module, target) for target in targets]
+
+    def generate_parallel(
+        self,
+        tree: ast.Module,
+        executor: Executor,
+        parts: typing.Optional[int] = None,
+    ) -> str:
+        """Return the stub text for a parsed module, rendered on an executor.
+
+        The top-level statements are split into contiguous runs, parts of
+        them defaulting to the CPU count, which fresh generators of this
+        class collect on a thread or process pool. They are created with the
+        literal size limit and budgets of this one, the budgets applying to
+        each run. Their records and imports are merged in statement order,
+        so the result equals generate().
+        """
+        self.reset()
+        if parts is None:
+            parts = os.cpu_count() or 1
+
+        runs = split_statements(tree.body, parts)
+        settings = {
+            "literal_size_limit": self.literal_size_limit,
+            "node_budget": self.node_budget,
+            "time_budget": self.time_budget,
+        }
+        for module, typevars in executor.map(
+            _collect_statements,
+            itertools.repeat(type(self)),
+            itertools.repeat(settings),
+            runs,
+        ):
+            self.module.update(module)
+            self.typevars.update(typevars)
+
+        return render_module(self.module)
+
+    def iter_lines(
+        self, tree: ast.Module, spool_size: int = SPOOL_SIZE
+    ) -> typing.Iterator[str]:
+        """Yield the stub for a parsed module line by line.
+
+        The imports header is only known once the whole module was visited,
+        so the rendered stub is spooled, in memory up to spool_size
+        characters and in a temporary file beyond that.
+        """
+        return self.iter_lines_from_trees((tree,), spool_size=spool_size)
+
+    def iter_lines_from_trees(
+        self, trees: typing.Iterable[ast.Module], spool_size: int = SPOOL_SIZE
+    ) -> typing.Iterator[str]:
+        """Yield the stub for a module given as consecutive parsed parts.
+
+        Like iter_lines(), but every part is dropped once visited, so only
+        one part needs to be in memory when trees is a generator.
+        """
+        self.reset()
+        stubs = self.stubs = _SpooledStubs(spool_size)
+        for tree in trees:
+            self.collect(tree)
+            del tree
+
+        yield from self.generate_imports().splitlines(keepends=True)
+        yield from stubs.lines()
+
+    def visit(self, node: ast.AST) -> None:
+        """Visit a node and everything scheduled while doing so.
+
+        Nested statements are not visited recursively but pushed onto an
+        explicit stack, so the nesting depth is not bound by the recursion
+        limit. Called from a visitor, the node is only scheduled.
+        """
+        self.pending.append(node)
+        if not self.draining:
+            self.drain()
+
+    def schedule(self, items: typing.Sequence[PendingItem]) -> None:
+        """Queue nodes to visit and callables to call after this visitor."""
+        self.pending.extend(reversed(items))
+
+    def drain(self) -> None:
+        pending = self.pending
+        dispatch_table = self.dispatch_table
+        node_budget = self.node_budget
+        deadline = self.deadline
+        self.draining = True
+        try:
+            while pending:
+                item = pending.pop()
+                if isinstance(item, ast.AST):
+                    self.visited_nodes += 1
+                    if node_budget is not None and self.visited_nodes > node_budget:
+                        raise BudgetExceeded(f"visited more than {node_budget} nodes")
+                    if deadline is not None and time.perf_counter() > deadline:
+                        raise BudgetExceeded(
+                            f"took longer than {self.time_budget} seconds"
+                        )
+                    visitor = dispatch_table.get(type(item))
+                    if visitor is not None:
+                        visitor(self, item)
+                else:
+                    item()
+        finally:
+            self.draining = False
+
+    def generic_visit(self, node: ast.AST) -> None:
+        # Only the statement containers below can hold declarations, there
+        # is no need to descend into anything else.
+        pass
+
+    def visit_Module(self, node: ast.Module) -> None:
+        self.schedule(node.body)
+
+    def visit_Try(self, node: ast.Try) -> None:
+        statements = list(node.body)
+        for handler in node.handlers:
+            statements.extend(handler.body)
+        statements.extend(node.orelse)
+        statements.extend(node.finalbody)
+        self.schedule(statements)
+
+    # Python 3.11 'except*' blocks
+    visit_TryStar = visit_Try
+
+    def visit_With(self, node: ast.With) -> None:
+        # e.g. 'with contextlib.suppress(ImportError):' around optional imports
+        self.schedule(node.body)
+
+    visit_AsyncWith = visit_With
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports_output.add(sys.intern(f"import {alias.name}"))
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = node.module if node.module is not None else "."
+        for alias in node.names:
+            name = alias.name
+            if module:
+                if module not in self.imports_helper_dict:
+                    self.imports_helper_dict[module] = set()
+                self.imports_helper_dict[module].add(name)
+
+    def visit_If(self, node: ast.If) -> None:
+        # '__main__' blocks never contribute to the stub, skip them
+        # here rather than removing them from the tree up front.
+        if is_main_block(node):
+            return
+
+        condition = version_condition(node.test)
+        if condition is None:
+            self.schedule(node.body + node.orelse)
+            return
+
+        # Both branches are kept, the renderer picks one for a target version,
+        # and so are the imports found in each of them.
+        stub = ConditionalStub(*condition)
+        outer_imports = self.import_stub
+        self.blocks.append(stub.body)
+        self.enter_imports(stub.body_imports)
+
+        def enter_orelse() -> None:
+            self.blocks[-1] = stub.orelse
+            self.enter_imports(stub.orelse_imports)
+
+        def leave_if() -> None:
+            self.blocks.pop()
+            self.enter_imports(outer_imports)
+            if any(
+                branch.from_imports or branch.imports or branch.conditions
+                for branch in (stub.body_imports, stub.orelse_imports)
+            ):
+                outer_imports.conditions.append(stub)
+            self.add_statement(stub)
+
+        self.schedule([*node.body, enter_orelse, *node.orelse, leave_if])
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        # Class bodies are only entered through visit_ClassDef, so outside
+        # of it a function cannot be a method.
+        if self.in_class:
+            self.visit_MethodDef(node)
+        else:
+            self.visit_RegularFunctionDef(node)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                target_name = target.id
+
+                if isinstance(node.value, ast.Call):
+                    if isinstance(node.value.func, ast.Name):
+                        handler = self.call_forms.get(node.value.func.id)
+                        if handler is not None:
+                            handler(self, target_name, node.value)
+                elif (
+                    isinstance(node.value, ast.Name)
+                    and node.value.id in self.typing_imports
+                ):
+                    target_type = node.value.id
+                    self.imports_output.add(target_type)
+                    self.add_statement(VariableStub(target_name, target_type))
+                elif isinstance(node.value, ast.Subscript):
+                    if isinstance(node.value.value, ast.Name):
+                        target_name = target.id
+                    target_type = self.annotation_cache.render(node.value)
+                    if "typing_extensions" not in self.imports_helper_dict:
+                        self.imports_helper_dict["typing_extensions"] = set()
+                    self.imports_helper_dict["typing_extensions"].add(
+                        "TypeAlias"
+                    )
+                    self.add_statement(
+                        VariableStub(target_name, "TypeAlias", target_type)
+                    )
+                # Handle module-level variables with an initialization value
+                elif not self.in_class:
+                    if self.is_large_value(node.value):
+                        target_type = infer_literal_type(node.value)
+                        if target_type is not None:
+                            stub = VariableStub(target_name, target_type)
+                        else:
+                            stub = VariableStub(target_name, value="...")
+                    else:
+                        target_type = unparse(node.value).strip()
+                        stub = VariableStub(target_name, value=target_type)
+                    self.add_statement(stub)
 
-def preprocess_source(source_code: str) -> str:
-    tree = ast.parse(source_code)
-    transformer = MainBlockRemover()
-    transformed_tree = transformer.visit(tree)
-    ast.fix_missing_locations(transformed_tree)
-    return ast.unparse(transformed_tree)
+            elif isinstance(target, ast.Subscript):
+                if isinstance(target.value, ast.Name):
+                    target_name = target.value.id
+                else:
+                    continue
+                if self.is_large_value(node.value):
+                    target_type = infer_literal_type(node.value) or "..."
+                else:
+                    target_type = unparse(node.value).strip()
+                self.add_statement(VariableStub(target_name, target_type))
 
+    def is_large_value(self, value: ast.expr) -> bool:
+        """Check if an assigned value is too large to copy into the stub."""
+        if self.literal_size_limit is None:
+            return False
 
-def generate_stub_from_source(
-    source_code: str, output_file_path: str, text_only: bool = False
-) -> typing.Union[str, None]:
-    preprocessed_code = preprocess_source(source_code)
-    tree = ast.parse(preprocessed_code)
-
-    class StubGenerator(ast.NodeVisitor):
-        def __init__(self) -> None:
-            self.stubs: list[str] = []
-            self.imports_helper_dict: dict[str, set[str]] = {}
-            self.imports_output: set[str] = set()
-            self.typing_imports = typing.__all__
-            self.in_class = False
-            self.indentation_level = 0
-            self.typevars: set[str] = set()
-
-        def visit_Import(self, node: ast.Import) -> None:
-            for alias in node.names:
-                self.imports_output.add(f"import {alias.name}")
-
-        def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
-            module = node.module if node.module is not None else "."
-            for alias in node.names:
-                name = alias.name
-                if module:
-                    if module not in self.imports_helper_dict:
-                        self.imports_helper_dict[module] = set()
-                    self.imports_helper_dict[module].add(name)
-
-        def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-            if self.in_class:
-                self.visit_MethodDef(node)
-            else:
-                for parent_node in ast.walk(tree):
-                    if isinstance(parent_node, ast.ClassDef):
-                        for child_node in parent_node.body:
-                            if (
-                                isinstance(child_node, ast.FunctionDef)
-                                and child_node.name == node.name
-                                and child_node.lineno == node.lineno
-                            ):
-                                # This is a method within a class
-                                return
-                self.visit_RegularFunctionDef(node)
-
-        def visit_Assign(self, node: ast.Assign) -> None:
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    target_name = target.id
-                    target_type = ast.unparse(node.value).strip()
+        remaining = self.literal_size_limit
+        pending = [value]
+        while pending:
+            remaining -= 1
+            if remaining < 0:
+                return True
+            pending.extend(ast.iter_child_nodes(pending.pop()))
+        return False
+
+    def add_statement(self, record: Statement) -> None:
+        """Add a record to the innermost class, version branch or module."""
+        if self.class_stack:
+            self.class_stack[-1].members.append(record)  # type: ignore
+        elif self.blocks:
+            self.blocks[-1].append(record)
+        else:
+            self.stubs.append(record)
+
+    def get_arguments(self, node: ast.FunctionDef) -> tuple[ArgumentStub, ...]:
+        return tuple(
+            [ArgumentStub(arg.arg, self.get_arg_type(arg)) for arg in node.args.args]
+        )
+
+    def get_function_return_type(self, node: ast.FunctionDef) -> str:
+        if node.returns:
+            return self.get_return_type(node.returns)
+
+        # Add typing import for Any
+        if "typing" not in self.imports_helper_dict:
+            self.imports_helper_dict["typing"] = set()
+        self.imports_helper_dict["typing"].add("Any")
+        return "Any"
+
+    def visit_MethodDef(self, node: ast.FunctionDef) -> None:
+        arguments = self.get_arguments(node)
+        return_type = self.get_function_return_type(node)
+
+        # handle the case where the node.name is __init__, __init__ is a special case which always returns None
+        if node.name == "__init__":
+            return_type = "None"
+
+        # Only the first plain name among the decorators is considered.
+        decorator = None
+        for obj in node.decorator_list:
+            if isinstance(obj, ast.Name):
+                if obj.id in ("classmethod", "staticmethod"):
+                    decorator = obj.id
+                break
+        self.add_statement(FunctionStub(node.name, arguments, return_type, decorator))
+
+    def visit_RegularFunctionDef(self, node: ast.FunctionDef) -> None:
+        arguments = self.get_arguments(node)
+        return_type = self.get_function_return_type(node)
+        self.add_statement(FunctionStub(node.name, arguments, return_type))
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        form = self.class_form(node)
+        stub = ClassStub(node.name)
+
+        class_has_generic = False
+        generic_types = []
+        for base in node.bases:
+            if (
+                isinstance(base, ast.Subscript)
+                and isinstance(base.value, ast.Name)
+                and base.value.id == "Generic"
+            ):
+                class_has_generic = True
+                if "typing" not in self.imports_helper_dict:
+                    self.imports_helper_dict["typing"] = set()
+                self.imports_helper_dict["typing"].add("Generic")
+
+                slice_node = base.slice
+                if type(slice_node) is _INDEX:
+                    slice_node = slice_node.value  # type: ignore
+                if isinstance(slice_node, ast.Tuple):
+                    for elt in slice_node.elts:
+                        if isinstance(elt, ast.Name):
+                            generic_types.append(elt.id)
+                elif isinstance(slice_node, ast.Name):
+                    generic_types.append(slice_node.id)
+
+                for type_name in generic_types:
+                    if type_name in self.typevars:
+                        continue
+                    self.typevars.add(type_name)
+                    if "typing" not in self.imports_helper_dict:
+                        self.imports_helper_dict["typing"] = set()
+                    self.imports_helper_dict["typing"].add("TypeVar")
+
+        # Sort the body out in a single pass, classes can be huge.
+        class_nodes: list[PendingItem] = []
+        method_nodes: list[PendingItem] = []
+        assignments: list[ast.stmt] = []
+        has_annotations = False
+        for child in node.body:
+            if isinstance(child, ast.FunctionDef):
+                method_nodes.append(child)
+            elif isinstance(child, ast.ClassDef):
+                class_nodes.append(child)
+            elif isinstance(child, ast.AnnAssign):
+                has_annotations = True
+                if form is not None:
+                    assignments.append(child)
+            elif isinstance(child, ast.Assign) and form is not None:
+                assignments.append(child)
+
+        if form is not None:
+            form(self, node, stub, assignments)
+        else:
+            stub.is_dataclass = has_annotations
+            if stub.is_dataclass:
+                self.imports_output.add("from dataclasses import dataclass")
 
+            for base in node.bases:
+                if isinstance(base, ast.Name):
+                    stub.bases.append(base.id)
+                elif isinstance(base, ast.Subscript):
                     if (
-                        isinstance(node.value, ast.Call)
-                        and isinstance(node.value.func, ast.Name)
-                        and node.value.func.id == "TypeVar"
+                        isinstance(base.value, ast.Name)
+                        and base.value.id == "Generic"
                     ):
-                        if "typing" not in self.imports_helper_dict:
-                            self.imports_helper_dict["typing"] = set()
-                        self.imports_helper_dict["typing"].add("TypeVar")
-                        self.typevars.add(target_name)
-                        # Add TypeVar to the stubs
-                        if node.value.args:
-                            typevar_def = f"{target_name} = TypeVar({', '.join([ast.unparse(arg) for arg in node.value.args])})"
-                            self.stubs.append(typevar_def + "\n\n")
-                        else:
-                            self.stubs.append(
-                                f'{target_name} = TypeVar("{target_name}")\n\n'
-                            )
-                        continue
-
-                    if target_type in self.typing_imports:
-                        self.imports_output.add(target_type)
-                    if target_type in self.typing_imports:
-                        stub = f"{target_name}: {target_type}\n"
-                        self.stubs.append(stub)
-                    else:
-                        if isinstance(node.value, ast.Call):
-                            if isinstance(node.value.func, ast.Name):
-                                if node.value.func.id == "frozenset":
-                                    stub = f"{target_name} = frozenset({', '.join([ast.unparse(arg).strip() for arg in node.value.args])})\n"
-                                    self.stubs.append(stub)
-                                elif node.value.func.id == "namedtuple":
-                                    tuple_name = ast.unparse(node.value.args[0]).strip()
-                                    stub = f"{target_name} =  namedtuple({tuple_name}, {', '.join([ast.unparse(arg).strip() for arg in node.value.args[1:]])})\n"
-                                    self.stubs.append(stub)
-                                elif node.value.func.id == "TypeVar":
-                                    # Add TypeVar import
-                                    if "typing" not in self.imports_helper_dict:
-                                        self.imports_helper_dict["typing"] = set()
-                                    self.imports_helper_dict["typing"].add("TypeVar")
-                                    self.typevars.add(target_name)
-                        elif isinstance(node.value, ast.Subscript):
-                            if isinstance(node.value.value, ast.Name):
-                                target_name = target.id
-                            target_type = ast.unparse(node.value).strip()
-                            if "typing_extensions" not in self.imports_helper_dict:
-                                self.imports_helper_dict["typing_extensions"] = set()
-                            self.imports_helper_dict["typing_extensions"].add(
-                                "TypeAlias"
-                            )
-                            stub = f"{target_name}: TypeAlias = {target_type}\n"
-                            self.stubs.append(stub)
-                        # Handle module-level variables with an initialization value
-                        elif not self.in_class:
-                            stub = f"{target_name} = {target_type}\n"
-                            self.stubs.append(stub)
-
-                elif isinstance(target, ast.Subscript):
-                    if isinstance(target.value, ast.Name):
-                        target_name = target.value.id
-                    else:
                         continue
-                    target_type = ast.unparse(node.value).strip()
-                    stub = f"{target_name}: {target_type}\n"
-                    self.stubs.append(stub)
-
-        def visit_MethodDef(self, node: ast.FunctionDef) -> None:
-            args_list = []
-            for arg in node.args.args:
-                arg_type = self.get_arg_type(arg)
-                args_list.append(f"{arg.arg}: {arg_type}")
-            if node.returns:
-                return_type = self.get_return_type(node.returns)
+                    base_name = self.annotation_cache.render(base)
+                    stub.bases.append(base_name)
+
+            if class_has_generic:
+                stub.bases.append(
+                    sys.intern(f"Generic[{', '.join(generic_types)}]")
+                )
+
+        parent = self.class_stack[-1] if self.class_stack else None
+        self.class_stack.append(stub)
+
+        # Nested classes come before the methods in the stub.
+        members = class_nodes
+        members.extend(method_nodes)
+
+        def leave_class() -> None:
+            self.class_stack.pop()
+            # Added once complete, so a streaming sink can render it at once.
+            if parent is not None:
+                parent.classes.append(stub)
             else:
-                return_type = "Any"
-                # Add typing import for Any
+                self.add_statement(stub)
+
+        # The members are visited from the pending stack once this returns,
+        # with the class still entered until leave_class() runs.
+        members.append(leave_class)
+        self.schedule(members)
+
+    def add_typed_dict_field(
+        self, stub: ClassStub, target: ast.expr, annotation: ast.expr
+    ) -> None:
+        if isinstance(target, ast.Subscript):
+            target = target.value
+        if isinstance(target, ast.Name):
+            target_type = self.annotation_cache.render(annotation)
+            stub.fields.append(VariableStub(target.id, target_type))
+
+    def class_form(self, node: ast.ClassDef) -> typing.Optional[ClassForm]:
+        """Return the special form handler of a class, None if it is regular."""
+        # Only the first plain name among the bases is considered.
+        for obj in node.bases:
+            if isinstance(obj, ast.Name):
+                return self.class_forms.get(obj.id)
+        return None
+
+    def get_arg_type(self, arg_node: ast.arg) -> str:
+        selfs = ["self", "cls"]
+        if arg_node.arg in selfs:
+            if arg_node.arg == "self":
+                if "typing_extensions" not in self.imports_helper_dict:
+                    self.imports_helper_dict["typing_extensions"] = set()
+                self.imports_helper_dict["typing_extensions"].add("Self")
+            return "Self" if arg_node.arg == "self" else arg_node.arg
+        elif arg_node.annotation:
+            unparsed = self.annotation_cache.render(arg_node.annotation)
+
+            if (
+                isinstance(arg_node.annotation, ast.Name)
+                and arg_node.annotation.id in self.typevars
+            ):
+                return arg_node.annotation.id
+
+            if unparsed.startswith("typing."):
+                type_name = sys.intern(unparsed.split(".")[-1])
                 if "typing" not in self.imports_helper_dict:
                     self.imports_helper_dict["typing"] = set()
-                self.imports_helper_dict["typing"].add("Any")
-
-            # Add indentation based on current indentation level (for regular and nested classes)
-            indent = "    " * (self.indentation_level + 1)
-
-            # handle the case where the node.name is __init__, __init__ is a special case which always returns None
-            if node.name == "__init__":
-                return_type = "None"
-            if node.decorator_list:
-                for decorator in node.decorator_list:
-                    if isinstance(decorator, ast.Name):
-                        if decorator.id == "classmethod":
-                            args_list = args_list[1:]
-                            stub = f"{indent}@classmethod\n{indent}def {node.name}(cls, {', '.join(args_list)}) -> {return_type}: ...\n"
-                            self.stubs.append(stub)
-                            return
-                        elif decorator.id == "staticmethod":
-                            stub = f"{indent}@staticmethod\n{indent}def {node.name}({', '.join(args_list)}) -> {return_type}: ...\n"
-                            self.stubs.append(stub)
-                            return
-                        else:
-                            stub = f"{indent}def {node.name}({', '.join(args_list)}) -> {return_type}: ...\n"
-                            self.stubs.append(stub)
-                            return
-            stub = f"{indent}def {node.name}({', '.join(args_list)}) -> {return_type}: ...\n"
-            self.stubs.append(stub)
-
-        def visit_RegularFunctionDef(self, node: ast.FunctionDef) -> None:
-            args_list = []
-            for arg in node.args.args:
-                arg_type = self.get_arg_type(arg)
-                args_list.append(f"{arg.arg}: {arg_type}")
-            if node.returns:
-                return_type = self.get_return_type(node.returns)
-            else:
-                return_type = "Any"
-                # Add typing import for Any
+                self.imports_helper_dict["typing"].add(type_name)
+                return type_name
+            return unparsed
+        else:
+            if "typing" not in self.imports_helper_dict:
+                self.imports_helper_dict["typing"] = set()
+            self.imports_helper_dict["typing"].add("Any")
+            return "Any"
+
+    def get_return_type(self, return_node: ast.AST) -> str:
+        if return_node:
+            unparsed = self.annotation_cache.render(return_node)
+
+            if (
+                isinstance(return_node, ast.Name)
+                and return_node.id in self.typevars
+            ):
+                return return_node.id
+
+            if unparsed.startswith("typing."):
+                type_name = sys.intern(unparsed.split(".")[-1])
                 if "typing" not in self.imports_helper_dict:
                     self.imports_helper_dict["typing"] = set()
-                self.imports_helper_dict["typing"].add("Any")
-
-            stub = (
-                f"def {node.name}({', '.join(args_list)}) -> {return_type}:\n    ...\n"
-            )
-            self.stubs.append(stub)
-            self.stubs.append("\n")
-
-        def visit_ClassDef(self, node: ast.ClassDef) -> None:
-            previous_in_class = self.in_class
-            self.in_class = True
-            previous_indent = self.indentation_level
-
-            # Add indentation for nested classes
-            if previous_in_class:
-                self.indentation_level += 1
-
-            class_name = node.name
-            indent = "    " * self.indentation_level
-            stub = ""
-            case = self.special_cases(node)
-
-            class_has_generic = False
-            generic_types = []
-            for base in node.bases:
-                if (
-                    isinstance(base, ast.Subscript)
-                    and isinstance(base.value, ast.Name)
-                    and base.value.id == "Generic"
-                ):
-                    class_has_generic = True
-                    if "typing" not in self.imports_helper_dict:
-                        self.imports_helper_dict["typing"] = set()
-                    self.imports_helper_dict["typing"].add("Generic")
-
-                    if isinstance(base.slice, ast.Tuple):
-                        for elt in base.slice.elts:
-                            if isinstance(elt, ast.Name):
-                                generic_types.append(elt.id)
-                    elif isinstance(base.slice, ast.Name):
-                        generic_types.append(base.slice.id)
-
-                    for type_name in generic_types:
-                        if type_name in self.typevars:
-                            continue
-                        self.typevars.add(type_name)
-                        if "typing" not in self.imports_helper_dict:
-                            self.imports_helper_dict["typing"] = set()
-                        self.imports_helper_dict["typing"].add("TypeVar")
-
-            if case == "TypedDict":
-                stub = f"{indent}class {class_name}(TypedDict):\n"
+                self.imports_helper_dict["typing"].add(type_name)
+                return type_name
+            return unparsed
+        else:
+            # No annotation means Any type
+            if "typing" not in self.imports_helper_dict:
+                self.imports_helper_dict["typing"] = set()
+            self.imports_helper_dict["typing"].add("Any")
+            return "Any"
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        target = node.target
+        if isinstance(node.annotation, ast.Name):
+            target_type = node.annotation.id
+        else:
+            target_type = self.annotation_cache.render(node.annotation)
+            if target_type.startswith("typing."):
+                type_name = sys.intern(target_type.split(".")[-1])
                 if "typing" not in self.imports_helper_dict:
                     self.imports_helper_dict["typing"] = set()
-                self.imports_helper_dict["typing"].add("TypedDict")
-                for key in node.body:
-                    if isinstance(key, ast.Assign):
-                        for target in key.targets:
-                            if isinstance(target, ast.Name):
-                                target_name = target.id
-                                target_type = ast.unparse(key.value).strip()
-                                stub += f"{indent}    {target_name}: {target_type}\n"
-                            elif isinstance(target, ast.Subscript):
-                                if isinstance(target.value, ast.Name):
-                                    target_name = target.value.id
-                                target_type = ast.unparse(key.value).strip()
-                                stub += f"{indent}    {target_name}: {target_type}\n"
-                    elif isinstance(key, ast.AnnAssign):
-                        target = key.target
-                        if isinstance(target, ast.Name):
-                            target_name = target.id
-                            target_type = ast.unparse(key.annotation).strip()
-                            stub += f"{indent}    {target_name}: {target_type}\n"
-                        elif isinstance(target, ast.Subscript):
-                            if isinstance(target.value, ast.Name):
-                                target_name = target.value.id
-                            target_type = ast.unparse(key.annotation).strip()
-                            stub += f"{indent}    {target_name}: {target_type}\n"
-            elif case == "Exception":
-                if not any(isinstance(n, ast.FunctionDef) for n in node.body):
-                    stub = f"{indent}class {class_name}(Exception): ..."
-                else:
-                    stub = f"{indent}class {class_name}(Exception):"
-            elif case == "NamedTuple":
-                stub = f"{indent}class {class_name}(NamedTuple):\n"
-                self.imports_output.add("from typing import NamedTuple")
-            else:
-                is_dataclass = any(isinstance(n, ast.AnnAssign) for n in node.body)
-                if is_dataclass:
-                    stub = f"{indent}@dataclass\n"
-                    self.imports_output.add("from dataclasses import dataclass")
-
-                class_def = f"{indent}class {class_name}"
-
-                bases = []
-
-                for base in node.bases:
-                    if isinstance(base, ast.Name):
-                        bases.append(base.id)
-                    elif isinstance(base, ast.Subscript):
-                        if (
-                            isinstance(base.value, ast.Name)
-                            and base.value.id == "Generic"
-                        ):
-                            continue
-                        base_name = ast.unparse(base).strip()
-                        bases.append(base_name)
-
-                if class_has_generic:
-                    bases.append(f"Generic[{', '.join(generic_types)}]")
-
-                if bases:
-                    class_def += f"({', '.join(bases)})"
-
-                class_def += ":"
-                stub += class_def
-
-            self.stubs.append(stub)
-
-            methods_or_classes = [
-                n for n in node.body if isinstance(n, (ast.FunctionDef, ast.ClassDef))
-            ]
-            if methods_or_classes:
-                self.stubs.append("\n")
-
-                class_nodes = []
-                method_nodes = []
-
-                for child in methods_or_classes:
-                    if isinstance(child, ast.ClassDef):
-                        class_nodes.append(child)
+                self.imports_helper_dict["typing"].add(type_name)
+                target_type = type_name
+
+        if not self.in_class:
+            if isinstance(target, ast.Name):
+                target_name = target.id
+                value_str = None
+                if node.value is not None:
+                    if self.is_large_value(node.value):
+                        # The annotation already gives the type.
+                        value_str = "..."
                     else:
-                        method_nodes.append(child)
-
-                for class_node in class_nodes:
-                    self.visit(class_node)
-
-                if class_nodes and method_nodes:
-                    self.stubs.append("\n")
-
-                for method_node in method_nodes:
-                    self.visit(method_node)
-
-            self.indentation_level = previous_indent
-            self.in_class = previous_in_class
-
-            if not previous_in_class:
-                self.stubs.append("\n")
+                        value_str = unparse(node.value).strip()
+                self.add_statement(VariableStub(target_name, target_type, value_str))
+                return
 
-        def special_cases(self, node: ast.ClassDef) -> typing.Union[str, bool]:
-            for obj in node.bases:
-                ob_instance = isinstance(obj, ast.Name)
-                if ob_instance:
-                    if obj.id == "TypedDict":  # type: ignore
-                        return "TypedDict"
-                    elif obj.id == "Exception":  # type: ignore
-                        return "Exception"
-                    elif obj.id == "NamedTuple":  # type: ignore
-                        return "NamedTuple"
+        if self.in_class:
+            if isinstance(node.annotation, ast.Subscript):
+                if isinstance(target, ast.Name):
+                    stub = VariableStub(target.id, target_type)
+                elif isinstance(target, ast.Subscript):
+                    if isinstance(target.value, ast.Name):
+                        target_name = target.value.id
+                    stub = VariableStub(target_name, target_type)
+            elif isinstance(node.annotation, ast.Name):
+                if isinstance(target, ast.Name):
+                    stub = VariableStub(target.id, target_type)
+                elif isinstance(target, ast.Subscript):
+                    if isinstance(target.value, ast.Name):
+                        target_name = target.value.id
+                    stub = VariableStub(target_name, target_type)
+            elif isinstance(node.annotation, ast.BinOp):
+                # Handle binary operations like Union types (int | str)
+                if isinstance(target, ast.Name):
+                    stub = VariableStub(target.id, target_type)
+                elif isinstance(target, ast.Subscript):
+                    if isinstance(target.value, ast.Name):
+                        target_name = target.value.id
+                        stub = VariableStub(target_name, target_type)
                     else:
-                        return False
-            return False
+                        stub = VariableStub(unparse(target), target_type)
+                else:
+                    stub = VariableStub(unparse(target), target_type)
+            else:
+                raise NotImplementedError(
+                    f"Type {type(node.annotation)} not implemented, report this issue"
+                )
+
+            self.add_statement(stub)
+
+    def generate_imports(self) -> str:
+        return render_imports(self.module)
+
+
+StubGenerator._build_dispatch_table()
+
+
+class SyntaxErrorSpan:
+    """Lines of a top-level statement left out of a stub for a syntax error.
+
+    lineno is the line of the error and message its description.
+    """
+
+    __slots__ = ("first_lineno", "last_lineno", "lineno", "message")
+
+    def __init__(
+        self,
+        first_lineno: int,
+        last_lineno: int,
+        lineno: typing.Optional[int],
+        message: str,
+    ) -> None:
+        self.first_lineno = first_lineno
+        self.last_lineno = last_lineno
+        self.lineno = lineno
+        self.message = message
+
+    def __repr__(self) -> str:
+        return (
+            f"SyntaxErrorSpan(first_lineno={self.first_lineno}, "
+            f"last_lineno={self.last_lineno}, lineno={self.lineno}, "
+            f"message={self.message!r})"
+        )
+
+
+def parse_source(
+    source_code: Source,
+    elide_bodies: bool = False,
+    syntax_errors: typing.Optional[list[SyntaxErrorSpan]] = None,
+) -> ast.Module:
+    """Parse a module, dropping the function bodies first if elide_bodies.
+
+    Given a syntax_errors list, a module that fails to parse is recovered
+    with recover_statements() instead of raising SyntaxError, and the spans
+    of the statements left out are added to the list.
+    """
+    if elide_bodies:
+        source_code = elide_function_bodies(decode_source(source_code))
+    try:
+        return ast.parse(source_code)
+    except SyntaxError:
+        if syntax_errors is None:
+            raise
+    return recover_statements(decode_source(source_code), syntax_errors)
+
+
+def _parse_lines(lines: list[str], first_lineno: int, end_lineno: int) -> ast.Module:
+    """Parse lines first_lineno to end_lineno, excluded, of a module.
+
+    Blank lines stand in for the lines before, so line numbers of the nodes
+    and errors are those of the module without renumbering the tree.
+    """
+    source_code = "".join(lines[first_lineno - 1 : end_lineno - 1])
+    return ast.parse("\n" * (first_lineno - 1) + source_code)
+
+
+def _statement_end(lines: list[str], first_lineno: int) -> int:
+    """Return the line after the top-level statement at first_lineno."""
+    readline = functools.partial(next, iter(lines[first_lineno - 1 :]), "")
+    try:
+        _, statement_source = next(iter_top_level_statements(readline), (0, ""))
+    except (tokenize.TokenError, SyntaxError):
+        # Not tokenizable up to the next statement, guess it from the lines.
+        _, statement_source = next(
+            iter_unindented_blocks(lines[first_lineno - 1 :], first_lineno)
+        )
+    return first_lineno + max(statement_source.count("\n"), 1)
+
+
+def _add_syntax_error(
+    syntax_errors: list[SyntaxErrorSpan],
+    lines: list[str],
+    first_lineno: int,
+    end_lineno: int,
+    error: SyntaxError,
+) -> None:
+    last_lineno = end_lineno - 1
+    while last_lineno > first_lineno and not lines[last_lineno - 1].strip():
+        last_lineno -= 1
+    syntax_errors.append(
+        SyntaxErrorSpan(first_lineno, last_lineno, error.lineno, error.msg)
+    )
 
-        def get_arg_type(self, arg_node: ast.arg) -> str:
-            selfs = ["self", "cls"]
-            if arg_node.arg in selfs:
-                if (
-                    arg_node.arg == "self"
-                    and "typing_extensions" not in self.imports_helper_dict
-                ):
-                    self.imports_helper_dict["typing_extensions"] = set()
-                    self.imports_helper_dict["typing_extensions"].add("Self")
-                return "Self" if arg_node.arg == "self" else arg_node.arg
-            elif arg_node.annotation:
-                unparsed = ast.unparse(arg_node.annotation).strip()
-
-                if (
-                    isinstance(arg_node.annotation, ast.Name)
-                    and arg_node.annotation.id in self.typevars
-                ):
-                    return arg_node.annotation.id
 
-                if unparsed.startswith("typing."):
-                    type_name = unparsed.split(".")[-1]
-                    if "typing" not in self.imports_helper_dict:
-                        self.imports_helper_dict["typing"] = set()
-                    self.imports_helper_dict["typing"].add(type_name)
-                    return type_name
-                return unparsed
-            else:
-                if "typing" not in self.imports_helper_dict:
-                    self.imports_helper_dict["typing"] = set()
-                self.imports_helper_dict["typing"].add("Any")
-                return "Any"
+def recover_statements(
+    source_code: str, syntax_errors: list[SyntaxErrorSpan]
+) -> ast.Module:
+    """Parse the top-level statements of a module that fails to parse.
+
+    Returns a module of the statements that parse, with their line numbers
+    in the source, and adds the span of every other statement to
+    syntax_errors.
+
+    The statement holding a reported error is located from the lines, the
+    statements before it are parsed at once and the rest of the module is
+    parsed again, so only the failing statements are tokenized. Where the
+    statements before don't parse, the error being reported later than it
+    occurs, every remaining statement is split off with
+    iter_top_level_statements() and parsed on its own.
+    """
+    lines = split_lines(source_code)
+    body: list[ast.stmt] = []
+    # First line of the part of the module left to parse.
+    lineno = 1
+    while lineno <= len(lines):
+        try:
+            body.extend(_parse_lines(lines, lineno, len(lines) + 1).body)
+            break
+        except SyntaxError as error:
+            failure = error
+
+        error_lineno = min(max(failure.lineno or lineno, lineno), len(lines))
+        # The last block up to the error is the statement holding it.
+        *_, (first_lineno, _) = iter_unindented_blocks(
+            lines[lineno - 1 : error_lineno], lineno
+        )
+        try:
+            body.extend(_parse_lines(lines, lineno, first_lineno).body)
+        except SyntaxError:
+            body.extend(_recover_statement_wise(lines, lineno, syntax_errors))
+            break
+
+        end_lineno = _statement_end(lines, first_lineno)
+        _add_syntax_error(syntax_errors, lines, first_lineno, end_lineno, failure)
+        lineno = end_lineno
+
+    return ast.Module(body=body, type_ignores=[])
+
+
+def _recover_statement_wise(
+    lines: list[str], lineno: int, syntax_errors: list[SyntaxErrorSpan]
+) -> list[ast.stmt]:
+    """Parse the statements from lineno on one by one.
+
+    Statements are split with iter_top_level_statements() up to where
+    tokenizing fails, from there at unindented lines.
+    """
+    body: list[ast.stmt] = []
+
+    def add_statement(first_lineno: int, statement_source: str) -> None:
+        end_lineno = first_lineno + statement_source.count("\n")
+        if not statement_source.endswith("\n"):
+            end_lineno += 1
+        try:
+            body.extend(_parse_lines(lines, first_lineno, end_lineno).body)
+        except SyntaxError as error:
+            _add_syntax_error(syntax_errors, lines, first_lineno, end_lineno, error)
+
+    readline = functools.partial(next, iter(lines[lineno - 1 :]), "")
+    # First line not handed to add_statement() yet.
+    next_lineno = lineno
+    try:
+        for first_lineno, statement_source in iter_top_level_statements(readline):
+            first_lineno += lineno - 1
+            add_statement(first_lineno, statement_source)
+            next_lineno = first_lineno + statement_source.count("\n")
+    except (tokenize.TokenError, SyntaxError):
+        for first_lineno, block in iter_unindented_blocks(
+            lines[next_lineno - 1 :], next_lineno
+        ):
+            add_statement(first_lineno, block)
+
+    return body
+
+
+def generate_budgeted_stub(
+    source_code: Source,
+    node_budget: typing.Optional[int] = None,
+    time_budget: typing.Optional[float] = None,
+    annotation_cache: typing.Optional[AnnotationCache] = None,
+    elide_bodies: bool = False,
+    syntax_errors: typing.Optional[list[SyntaxErrorSpan]] = None,
+) -> tuple[str, bool]:
+    """Return the stub text of the source and whether it is degraded.
+
+    The time budget starts before parsing. A module that goes over a budget
+    gets the stub of degraded_stub() instead. Parsing itself is not
+    interrupted, a module that took the whole time budget to parse is not
+    visited at all. syntax_errors is that of parse_source().
+    """
+    start = time.perf_counter()
+    tree = parse_source(source_code, elide_bodies, syntax_errors)
+
+    if time_budget is not None:
+        time_budget -= time.perf_counter() - start
+        if time_budget <= 0:
+            return degraded_stub(tree), True
+    stub_generator = StubGenerator(
+        annotation_cache=annotation_cache,
+        node_budget=node_budget,
+        time_budget=time_budget,
+    )
+    try:
+        return stub_generator.generate(tree), False
+    except BudgetExceeded:
+        return degraded_stub(tree), True
 
-        def get_return_type(self, return_node: ast.AST) -> str:
-            if return_node:
-                unparsed = ast.unparse(return_node).strip()
 
-                if (
-                    isinstance(return_node, ast.Name)
-                    and return_node.id in self.typevars
-                ):
-                    return return_node.id
+def generate_stub_from_source(
+    source_code: Source,
+    output_file_path: str,
+    text_only: bool = False,
+    annotation_cache: typing.Optional[AnnotationCache] = None,
+    elide_bodies: bool = False,
+    executor: typing.Optional[Executor] = None,
+    node_budget: typing.Optional[int] = None,
+    time_budget: typing.Optional[float] = None,
+    syntax_errors: typing.Optional[list[SyntaxErrorSpan]] = None,
+) -> typing.Union[str, None]:
+    """Generate the stub of a module given as source.
+
+    With a node or time budget, see generate_budgeted_stub(), modules going
+    over it get a degraded stub and the executor is not used. Given a
+    syntax_errors list, modules with syntax errors get the stub of the
+    statements that parse, see parse_source().
+    """
+    if node_budget is not None or time_budget is not None:
+        out_str, _ = generate_budgeted_stub(
+            source_code,
+            node_budget,
+            time_budget,
+            annotation_cache,
+            elide_bodies,
+            syntax_errors,
+        )
+        if text_only:
+            return out_str
+        with open(output_file_path, "w") as output_file:
+            output_file.write(out_str)
+        return None
 
-                if unparsed.startswith("typing."):
-                    type_name = unparsed.split(".")[-1]
-                    if "typing" not in self.imports_helper_dict:
-                        self.imports_helper_dict["typing"] = set()
-                    self.imports_helper_dict["typing"].add(type_name)
-                    return type_name
-                return unparsed
-            else:
-                # No annotation means Any type
-                if "typing" not in self.imports_helper_dict:
-                    self.imports_helper_dict["typing"] = set()
-                self.imports_helper_dict["typing"].add("Any")
-                return "Any"
+    tree = parse_source(source_code, elide_bodies, syntax_errors)
+    return generate_stub_from_ast(
+        tree, output_file_path, text_only, annotation_cache, executor
+    )
 
-        def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
-            target = node.target
-            if isinstance(node.annotation, ast.Name):
-                target_type = node.annotation.id
-            else:
-                target_type = ast.unparse(node.annotation).strip()
-                if target_type.startswith("typing."):
-                    type_name = target_type.split(".")[-1]
-                    if "typing" not in self.imports_helper_dict:
-                        self.imports_helper_dict["typing"] = set()
-                    self.imports_helper_dict["typing"].add(type_name)
-                    target_type = type_name
 
-            if not self.in_class:
-                if isinstance(target, ast.Name):
-                    target_name = target.id
-                    if node.value is not None:
-                        value_str = ast.unparse(node.value).strip()
-                        stub = f"{target_name}: {target_type} = {value_str}\n"
-                    else:
-                        stub = f"{target_name}: {target_type}\n"
-                    self.stubs.append(stub)
-                    return
-
-            if self.in_class:
-                indent = "    " * (self.indentation_level + 1)
-
-                if isinstance(node.annotation, ast.Subscript):
-                    if isinstance(target, ast.Name):
-                        stub = f"{indent}{target.id}: {target_type}\n"
-                    elif isinstance(target, ast.Subscript):
-                        if isinstance(target.value, ast.Name):
-                            target_name = target.value.id
-                        stub = f"{indent}{target_name}: {target_type}\n"
-                elif isinstance(node.annotation, ast.Name):
-                    if isinstance(target, ast.Name):
-                        stub = f"{indent}{target.id}: {target_type}\n"
-                    elif isinstance(target, ast.Subscript):
-                        if isinstance(target.value, ast.Name):
-                            target_name = target.value.id
-                        stub = f"{indent}{target_name}: {target_type}\n"
-                elif isinstance(node.annotation, ast.BinOp):
-                    # Handle binary operations like Union types (int | str)
-                    if isinstance(target, ast.Name):
-                        stub = f"{indent}{target.id}: {target_type}\n"
-                    elif isinstance(target, ast.Subscript):
-                        if isinstance(target.value, ast.Name):
-                            target_name = target.value.id
-                            stub = f"{indent}{target_name}: {target_type}\n"
-                        else:
-                            stub = f"{indent}{ast.unparse(target)}: {target_type}\n"
-                    else:
-                        stub = f"{indent}{ast.unparse(target)}: {target_type}\n"
-                else:
-                    raise NotImplementedError(
-                        f"Type {type(node.annotation)} not implemented, report this issue"
-                    )
+def generate_stub_from_ast(
+    tree: ast.Module,
+    output_file_path: str,
+    text_only: bool = False,
+    annotation_cache: typing.Optional[AnnotationCache] = None,
+    executor: typing.Optional[Executor] = None,
+) -> typing.Union[str, None]:
+    """Generate the stub of an already parsed module.
+
+    The stub is the one generate_stub_from_source() gives for the source of
+    the tree. The tree is only read, it can be used again afterwards, and
+    needs no line numbers.
+    """
+    if not isinstance(tree, ast.Module):
+        raise TypeError(f"Expected an ast.Module, got {type(tree).__name__}")
+    stub_generator = StubGenerator(annotation_cache=annotation_cache)
+
+    if executor is not None:
+        out_str = stub_generator.generate_parallel(tree, executor)
+        if text_only:
+            return out_str
+        with open(output_file_path, "w") as output_file:
+            output_file.write(out_str)
+        return None
+    elif text_only:
+        return stub_generator.generate(tree)
+    else:
+        with open(output_file_path, "w") as output_file:
+            output_file.writelines(stub_generator.iter_lines(tree))
+        return None
 
-                self.stubs.append(stub)
 
-        def generate_imports(self) -> str:
-            imports = []
-            imports.append("from __future__ import annotations\n")
+def generate_stub_variants(
+    source_code: Source,
+    targets: typing.Iterable[RenderTarget],
+    annotation_cache: typing.Optional[AnnotationCache] = None,
+    elide_bodies: bool = False,
+) -> list[str]:
+    """Return the stub text of the source for every target.
 
-            sorted_items = sorted(self.imports_helper_dict.items())
-            for module, names in sorted_items:
-                if names:
-                    imports.append(f"from {module} import {', '.join(sorted(names))}\n")
+    The source is parsed and visited once for all of them.
+    """
+    if elide_bodies:
+        source_code = elide_function_bodies(decode_source(source_code))
 
-            for imp in sorted(self.imports_output):
-                if imp != "from __future__ import annotations":
-                    imports.append(f"{imp}\n")
+    tree = ast.parse(source_code)
+    stub_generator = StubGenerator(annotation_cache=annotation_cache)
+    return stub_generator.generate_variants(tree, targets)
 
-            return "".join(imports) + "\n" if imports else ""
 
-    stub_generator = StubGenerator()
-    stub_generator.visit(tree)
-    out_str = ""
+def iter_stub_lines(source_code: Source) -> typing.Iterator[str]:
+    """Return an iterator over the lines of the stub for the source."""
+    tree = ast.parse(source_code)
+    return StubGenerator().iter_lines(tree)
 
-    imports_str = stub_generator.generate_imports()
-    if imports_str:
-        out_str += imports_str
 
-    for stub in stub_generator.stubs:
-        out_str += stub
+def write_stub(source_code: Source, stream: typing.IO[typing.Any]) -> None:
+    """Write the stub for the source to a text or binary stream.
 
-    if text_only:
-        return out_str
+    Binary streams receive UTF-8 encoded output.
+    """
+    lines = iter_stub_lines(source_code)
+    if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+        stream.writelines(line.encode("utf-8") for line in lines)
     else:
-        with open(output_file_path, "w") as output_file:
-            output_file.write(out_str)
-        return None
+        stream.writelines(lines)
+
+
+def parse_statement(
+    first_lineno: int, source_code: str, elide_bodies: bool = False
+) -> ast.Module:
+    """Parse a part of a module starting at the given line number.
+
+    Line numbers of syntax errors are reported relative to the module.
+    """
+    if elide_bodies:
+        source_code = elide_function_bodies(source_code)
+
+    try:
+        return ast.parse(source_code)
+    except SyntaxError as error:
+        if error.lineno is not None:
+            error.lineno += first_lineno - 1
+        if getattr(error, "end_lineno", None) is not None:
+            error.end_lineno += first_lineno - 1
+        raise
+
+
+def iter_chunked_stub_lines(
+    readline: typing.Callable[[], str],
+    annotation_cache: typing.Optional[AnnotationCache] = None,
+    elide_bodies: bool = False,
+) -> typing.Iterator[str]:
+    """Yield the stub lines of a module read with readline, statement-wise.
+
+    Every top-level statement is parsed, visited and released in turn, so
+    peak memory follows the largest statement rather than the module.
+    """
+    stub_generator = StubGenerator(annotation_cache=annotation_cache)
+    # Lines read past the statements parsed so far, starting at next_lineno.
+    pending_lines: list[str] = []
+    next_lineno = 1
+
+    def recording_readline() -> str:
+        line = readline()
+        pending_lines.append(line)
+        return line
+
+    def iter_trees() -> typing.Iterator[ast.Module]:
+        nonlocal next_lineno
+        for first_lineno, statement_source in iter_top_level_statements(
+            recording_readline
+        ):
+            end_lineno = first_lineno + statement_source.count("\n")
+            del pending_lines[: end_lineno - next_lineno]
+            next_lineno = end_lineno
+            yield parse_statement(first_lineno, statement_source, elide_bodies)
+
+    try:
+        yield from stub_generator.iter_lines_from_trees(iter_trees())
+    except tokenize.TokenError as error:
+        # Tokenizing fails at the end of the module, parse the statement left
+        # to report the error where it is, like the parser does.
+        parse_statement(next_lineno, "".join(pending_lines))
+        message, (lineno, offset) = error.args
+        raise SyntaxError(message, (None, lineno, offset, None)) from error
 
 
 def generate_stub(
-    source_file_path: str, output_file_path: str, text_only: bool = False
+    source_file_path: str,
+    output_file_path: str,
+    text_only: bool = False,
+    annotation_cache: typing.Optional[AnnotationCache] = None,
+    elide_bodies: bool = False,
+    chunked: bool = False,
+    prescan: bool = True,
+    node_budget: typing.Optional[int] = None,
+    time_budget: typing.Optional[float] = None,
+    syntax_errors: typing.Optional[list[SyntaxErrorSpan]] = None,
 ) -> typing.Union[str, None]:
-    with open(source_file_path, "r", encoding="utf-8") as source_file:
-        source_code = source_file.read()
+    """Generate the stub of a source file.
+
+    Unless prescan is false, modules that can only contribute imports to
+    their stub are recognized without parsing them, see
+    scan_trivial_source(). Budgets are those of generate_budgeted_stub() and
+    syntax_errors that of parse_source(), neither works with chunked.
+    """
+    if chunked and (
+        node_budget is not None or time_budget is not None or syntax_errors is not None
+    ):
+        raise ValueError(
+            "Budgets and syntax error recovery are not supported with chunked "
+            "generation"
+        )
+    if chunked:
+        with tokenize.open(source_file_path) as source_file:
+            lines = iter_chunked_stub_lines(
+                source_file.readline,
+                annotation_cache=annotation_cache,
+                elide_bodies=elide_bodies,
+            )
+            if text_only:
+                return "".join(lines)
+            with open(output_file_path, "w") as output_file:
+                output_file.writelines(lines)
+            return None
 
-    return generate_stub_from_source(
-        source_code=source_code, output_file_path=output_file_path, text_only=text_only
-    )
+    # The undecoded file is parsed in place, without a text copy of it.
+    with map_source(source_file_path) as source_code:
+        imports = scan_trivial_source(source_code) if prescan else None
+        if imports is not None:
+            source_code = imports
+        return generate_stub_from_source(
+            source_code=source_code,
+            output_file_path=output_file_path,
+            text_only=text_only,
+            annotation_cache=annotation_cache,
+            elide_bodies=elide_bodies,
+            node_budget=node_budget,
+            time_budget=time_budget,
+            syntax_errors=syntax_errors,
+        )
 
 
 def generate_text_stub(source_file_path: str) -> str:
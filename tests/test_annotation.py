@@ -0,0 +1,132 @@
+from src.Ast_Stubgen.annotation import (
+    AnnotationCache,
+    annotation_key,
+    render_annotation,
+)
+from src.Ast_Stubgen.stubgen import (
+    StubGenerator,
+    generate_stub_from_source,
+    generate_text_stub,
+)
+from pathlib import Path
+import ast
+import pytest
+import sys
+
+HELPER_FILES = Path(__file__).parent / "helper_files"
+
+
+def annotation(source: str) -> ast.expr:
+    return ast.parse(source, mode="eval").body
+
+
+def test_annotation_key() -> None:
+    assert annotation_key(annotation("Dict[str, Any]")) == annotation_key(
+        annotation("Dict[str,   Any]")
+    )
+    assert annotation_key(annotation("'x'")) != annotation_key(annotation("x"))
+    assert annotation_key(annotation("1")) != annotation_key(annotation("True"))
+    assert annotation_key(annotation("int | None")) != annotation_key(
+        annotation("int & None")
+    )
+
+
+def test_cache_counters_and_bound() -> None:
+    cache = AnnotationCache(maxsize=2)
+    assert cache.render(annotation("Optional[str]")) == "Optional[str]"
+    assert cache.render(annotation("Optional[ str ]")) == "Optional[str]"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.render(annotation("int"))
+    cache.render(annotation("str"))
+    assert len(cache) == 2
+    cache.render(annotation("Optional[str]"))
+    assert (cache.hits, cache.misses) == (1, 4)
+
+    cache.clear()
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
+
+
+def test_cache_shared_between_files() -> None:
+    cache = AnnotationCache()
+    for name in ("code.py", "backup_full_code.py"):
+        path = HELPER_FILES / name
+        assert generate_stub_from_source(
+            path.read_text(), "", text_only=True, annotation_cache=cache
+        ) == generate_text_stub(path.as_posix())
+    assert cache.hits > cache.misses
+
+
+DIFFERENTIAL_SOURCES = [
+    "Dict[str, Any]",
+    "a.b.c[int | None, ...]",
+    "X[()]",
+    "X[a,]",
+    "X[(a, b), c]",
+    "(a, b) | c",
+    "a | (b | c)",
+    "(a | b) | c",
+    "(a, b)",
+    "(a,)",
+    "()",
+    "List[[int, str]]",
+    "Literal['a', \"b'c\", 'd\"e', 'f\\'g', 1, True, None, ...]",
+    "Literal['\\n', u'x', b'y', 1.5, -1]",
+    "Callable[..., f()]",
+    "tuple[*Ts]",
+    "(a | b).c",
+    "(1).real",
+    "x[1:2]",
+    "'Outer.Inner'",
+]
+
+
+def iter_annotations(tree: ast.AST):
+    for node in ast.walk(tree):
+        if isinstance(node, ast.arg) and node.annotation is not None:
+            yield node.annotation
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.returns:
+            yield node.returns
+        elif isinstance(node, ast.AnnAssign):
+            yield node.annotation
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 9), reason="ast.unparse was added in Python 3.9"
+)
+def test_render_annotation_matches_unparse() -> None:
+    for source in DIFFERENTIAL_SOURCES:
+        node = ast.parse(source, mode="eval").body
+        assert render_annotation(node) == ast.unparse(node), source
+
+    stdlib = Path(ast.__file__).parent
+    for name in ("typing.py", "dataclasses.py", "functools.py", "enum.py"):
+        tree = ast.parse((stdlib / name).read_text(encoding="utf-8"))
+        for node in iter_annotations(tree):
+            assert render_annotation(node) == ast.unparse(node)
+    for path in HELPER_FILES.glob("*.py"):
+        for node in iter_annotations(ast.parse(path.read_text())):
+            assert render_annotation(node) == ast.unparse(node)
+
+
+def test_rendered_annotations_are_interned() -> None:
+    cache = AnnotationCache(maxsize=1)
+    first = cache.render(ast.parse("Dict[str, List[int]]", mode="eval").body)
+    cache.render(ast.parse("Other", mode="eval").body)
+    again = cache.render(ast.parse("Dict[str, List[int]]", mode="eval").body)
+    assert cache.misses == 3
+    assert again is first
+
+
+def test_import_bookkeeping_is_interned() -> None:
+    source = "import os.path\ndef f(x: typing.Optional[int]) -> None:\n    pass\n"
+    modules = []
+    for _ in range(2):
+        stub_generator = StubGenerator(annotation_cache=AnnotationCache(maxsize=1))
+        stub_generator.collect(ast.parse(source))
+        modules.append(stub_generator.module)
+
+    [first_line], [second_line] = (module.imports for module in modules)
+    assert first_line is second_line
+    [first_name], [second_name] = (module.from_imports["typing"] for module in modules)
+    assert first_name is second_name
@@ -0,0 +1,87 @@
+from src.Ast_Stubgen import batch
+from src.Ast_Stubgen.batch import BatchReport, generate_stubs
+from src.Ast_Stubgen.stubgen import StubGenerator, generate_text_stub
+from pathlib import Path
+import ast
+import pytest
+import sys
+
+HELPER_FILES = Path(__file__).parent / "helper_files"
+SOURCES = ["bubble_sort.py", "code.py", "backup_full_code.py"]
+
+
+def test_generate_stubs_threaded(tmp_path: Path) -> None:
+    jobs = [
+        ((HELPER_FILES / name).as_posix(), (tmp_path / f"{name}i").as_posix())
+        for name in SOURCES * 4
+    ]
+    assert generate_stubs(jobs, max_workers=4) == [output for _, output in jobs]
+
+    for source, output in jobs:
+        assert Path(output).read_text() == generate_text_stub(source)
+
+
+def test_default_workers_follow_the_gil(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    jobs = [
+        ((HELPER_FILES / name).as_posix(), (tmp_path / f"{name}i").as_posix())
+        for name in SOURCES
+    ]
+
+    def no_pool(*args: object, **kwargs: object) -> None:
+        raise AssertionError("a thread pool was used")
+
+    monkeypatch.setattr(batch, "ThreadPoolExecutor", no_pool)
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: True, raising=False)
+    assert generate_stubs(jobs) == [output for _, output in jobs]
+
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+    with pytest.raises(AssertionError):
+        generate_stubs(jobs)
+
+
+def test_generator_reuse() -> None:
+    generator = StubGenerator()
+    for name in SOURCES:
+        path = HELPER_FILES / name
+        tree = ast.parse(path.read_text())
+        assert generator.generate(tree) == generate_text_stub(path.as_posix())
+
+
+def test_report_counts_short_circuited_files(tmp_path: Path) -> None:
+    script = tmp_path / "script.py"
+    script.write_text('import os\n\nif __name__ == "__main__":\n    x = 1\n')
+    jobs = [
+        ((HELPER_FILES / "code.py").as_posix(), (tmp_path / "code.pyi").as_posix()),
+        (script.as_posix(), (tmp_path / "script.pyi").as_posix()),
+    ]
+
+    report = BatchReport()
+    generate_stubs(jobs, max_workers=1, report=report)
+    assert (report.files, report.short_circuited) == (2, 1)
+    assert (tmp_path / "script.pyi").read_text() == generate_text_stub(
+        script.as_posix()
+    )
+
+
+def test_report_lists_degraded_files(tmp_path: Path) -> None:
+    large = tmp_path / "large.py"
+    large.write_text(
+        "".join(f"def f{i}(a: int) -> int:\n    pass\n" for i in range(50))
+    )
+    jobs = [
+        ((HELPER_FILES / "code.py").as_posix(), (tmp_path / "code.pyi").as_posix()),
+        (large.as_posix(), (tmp_path / "large.pyi").as_posix()),
+    ]
+
+    report = BatchReport()
+    generate_stubs(jobs, max_workers=2, report=report, node_budget=40)
+    assert report.degraded == [large.as_posix()]
+    assert (tmp_path / "code.pyi").read_text() == generate_text_stub(
+        (HELPER_FILES / "code.py").as_posix()
+    )
+    assert (tmp_path / "large.pyi").read_text() == (
+        "from __future__ import annotations\nfrom typing import Any\n\n"
+        + "".join(f"f{i}: Any\n" for i in range(50))
+    )
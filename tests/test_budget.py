@@ -0,0 +1,95 @@
+from src.Ast_Stubgen.stubgen import (
+    BudgetExceeded,
+    StubGenerator,
+    degraded_stub,
+    generate_budgeted_stub,
+    generate_stub,
+    generate_stub_from_source,
+)
+from pathlib import Path
+import ast
+import pytest
+
+HELPER_FILES = Path(__file__).parent / "helper_files"
+
+SOURCE = """
+import os
+from typing import List
+
+a, (b, c) = 1, (2, 3)
+d: int = 4
+
+def f(x: int) -> int:
+    return x
+
+class C:
+    e = 5
+
+if sys.version_info >= (3, 8):
+    g = 1
+else:
+    h = 2
+
+try:
+    import json
+except ImportError:
+    json = None
+
+if __name__ == "__main__":
+    main = 1
+"""
+
+
+def test_degraded_stub() -> None:
+    tree = ast.parse(SOURCE)
+    dump = ast.dump(tree)
+    assert degraded_stub(tree) == (
+        "from __future__ import annotations\n"
+        "from typing import Any\n"
+        "\n"
+        "a: Any\n"
+        "b: Any\n"
+        "c: Any\n"
+        "d: Any\n"
+        "f: Any\n"
+        "C: Any\n"
+        "g: Any\n"
+        "h: Any\n"
+        "json: Any\n"
+    )
+    assert ast.dump(tree) == dump
+
+
+def test_node_budget() -> None:
+    tree = ast.parse(SOURCE)
+    with pytest.raises(BudgetExceeded):
+        StubGenerator(node_budget=5).generate(tree)
+
+    generator = StubGenerator(node_budget=100)
+    assert generator.generate(tree) == StubGenerator().generate(tree)
+    assert generator.visited_nodes <= 100
+
+
+def test_generate_budgeted_stub() -> None:
+    assert generate_budgeted_stub(SOURCE, time_budget=0) == (
+        degraded_stub(ast.parse(SOURCE)),
+        True,
+    )
+    assert generate_budgeted_stub(SOURCE, node_budget=100, time_budget=60) == (
+        StubGenerator().generate(ast.parse(SOURCE)),
+        False,
+    )
+    assert generate_stub_from_source(
+        SOURCE, "", text_only=True, node_budget=5
+    ) == degraded_stub(ast.parse(SOURCE))
+
+
+def test_chunked_generation_has_no_budget() -> None:
+    with pytest.raises(ValueError):
+        generate_stub(
+            (HELPER_FILES / "code.py").as_posix(),
+            "",
+            text_only=True,
+            chunked=True,
+            node_budget=10,
+        )
@@ -0,0 +1,43 @@
+from src.Ast_Stubgen.annotation import AnnotationCache
+from src.Ast_Stubgen.stubgen import StubGenerator, generate_stub_from_source
+import ast
+import sys
+
+DEPTH = sys.getrecursionlimit() * 2
+
+
+def test_deeply_nested_if_blocks() -> None:
+    body: list[ast.stmt] = [ast.parse("def f(a: int) -> int:\n    pass").body[0]]
+    for _ in range(DEPTH):
+        body = [ast.If(test=ast.Name(id="x"), body=body, orelse=[])]
+
+    stub = StubGenerator().generate(ast.Module(body=body, type_ignores=[]))
+    assert stub.endswith("def f(a: int) -> int:\n    ...\n\n")
+
+
+def test_deeply_nested_classes() -> None:
+    depth = 500
+    body: list[ast.stmt] = [ast.parse("def f(self) -> int:\n    pass").body[0]]
+    for level in range(depth):
+        body = [
+            ast.ClassDef(
+                name=f"C{level}", bases=[], keywords=[], body=body, decorator_list=[]
+            )
+        ]
+
+    stub = StubGenerator().generate(ast.Module(body=body, type_ignores=[]))
+    indent = "    " * depth
+    assert f"{indent}def f(self: Self) -> int: ...\n" in stub
+
+
+def test_deep_union_annotation() -> None:
+    source = "x: " + " | ".join(["Optional[int]"] * 900) + "\n"
+    assert generate_stub_from_source(source, "", text_only=True) == (
+        "from __future__ import annotations\n\n" + source
+    )
+
+
+def test_deep_union_annotation_cached() -> None:
+    cache = AnnotationCache()
+    node = ast.parse(" | ".join(["int"] * 900), mode="eval").body
+    assert cache.render(node) == " | ".join(["int"] * 900)
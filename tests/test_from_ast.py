@@ -0,0 +1,60 @@
+from src.Ast_Stubgen.stubgen import (
+    generate_stub_from_ast,
+    generate_stub_from_source,
+)
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import ast
+import pytest
+
+HELPER_FILES = Path(__file__).parent / "helper_files"
+
+
+def test_same_stub_as_from_source(tmp_path: Path) -> None:
+    for path in sorted(HELPER_FILES.glob("*.py")):
+        source = path.read_text()
+        tree = ast.parse(source)
+        dump = ast.dump(tree, include_attributes=True)
+        expected = generate_stub_from_source(source, "", text_only=True)
+
+        assert generate_stub_from_ast(tree, "", text_only=True) == expected
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert (
+                generate_stub_from_ast(tree, "", text_only=True, executor=executor)
+                == expected
+            )
+        output = tmp_path / f"{path.stem}.pyi"
+        generate_stub_from_ast(tree, output.as_posix())
+        assert output.read_text() == expected
+        # The tree is left as it was.
+        assert ast.dump(tree, include_attributes=True) == dump
+
+
+def test_tree_without_locations() -> None:
+    tree = ast.Module(
+        body=[
+            ast.FunctionDef(
+                name="f",
+                args=ast.arguments(
+                    posonlyargs=[],
+                    args=[ast.arg(arg="a", annotation=ast.Name(id="int"))],
+                    kwonlyargs=[],
+                    kw_defaults=[],
+                    defaults=[],
+                ),
+                body=[ast.Pass()],
+                decorator_list=[],
+                returns=ast.Name(id="str"),
+            )
+        ],
+        type_ignores=[],
+    )
+    assert generate_stub_from_ast(tree, "", text_only=True) == (
+        "from __future__ import annotations\n\ndef f(a: int) -> str:\n    ...\n\n"
+    )
+
+
+def test_rejects_other_nodes() -> None:
+    with pytest.raises(TypeError):
+        generate_stub_from_ast(ast.parse("x", mode="eval"), "", text_only=True)  # type: ignore
+
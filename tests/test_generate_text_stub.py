@@ -1,5 +1,11 @@
-from src.Ast_Stubgen.stubgen import generate_text_stub
+from src.Ast_Stubgen.stubgen import (
+    StubGenerator,
+    generate_stub_from_source,
+    generate_text_stub,
+    is_main_block,
+)
 from pathlib import Path
+import ast
 
 
 def test_bubble_sort() -> None:
@@ -88,3 +94,130 @@ JsonSet: TypeAlias = set[JsonDict]
 JsonUnion: TypeAlias = Union[JsonDict, JsonList, JsonTuple, JsonSet]
 """
     )
+
+
+def test_main_block_skipped_without_reparse() -> None:
+    source = """
+import os
+
+if os.name == "nt":
+    if __name__ == "__main__":
+        print("main")
+
+def run(arg: int) -> None:
+    pass
+
+if __name__ == "__main__":
+    def helper() -> None:
+        pass
+"""
+    assert (
+        generate_stub_from_source(source, "", text_only=True)
+        == """from __future__ import annotations
+import os
+
+def run(arg: int) -> None:
+    ...
+
+"""
+    )
+
+
+def test_main_blocks_are_skipped() -> None:
+    for name in ("bubble_sort.py", "code.py", "backup_full_code.py"):
+        source = (Path(__file__).parent / "helper_files" / name).read_text()
+        tree = ast.parse(source)
+        tree.body = [node for node in tree.body if not is_main_block(node)]
+        assert generate_stub_from_source(
+            source, "", text_only=True
+        ) == StubGenerator().generate(tree)
+
+
+def test_visitor_only_descends_into_statement_containers() -> None:
+    source = """
+try:
+    import json
+except ImportError:
+    json = None
+
+for i in range(3):
+    counter = i
+
+async def fetch(url: str) -> bytes:
+    response = await get(url)
+    return response
+"""
+    generator = StubGenerator()
+    assert (
+        generator.generate(ast.parse(source))
+        == """from __future__ import annotations
+import json
+
+json = None
+"""
+    )
+    # Module, Try, Import, Assign, For and AsyncFunctionDef
+    assert generator.visited_nodes == 6
+
+
+def test_with_bodies_are_visited() -> None:
+    source = """
+import contextlib
+
+with contextlib.suppress(ImportError):
+    from fast import Impl
+"""
+    assert (
+        StubGenerator().generate(ast.parse(source))
+        == """from __future__ import annotations
+from fast import Impl
+import contextlib
+
+"""
+    )
+
+
+def test_dispatch_table_follows_subclasses() -> None:
+    class NoAssignGenerator(StubGenerator):
+        def visit_Assign(self, node: ast.Assign) -> None:
+            pass
+
+    assert StubGenerator.dispatch_table[ast.Assign] is StubGenerator.visit_Assign
+    assert (
+        NoAssignGenerator.dispatch_table[ast.Assign] is NoAssignGenerator.visit_Assign
+    )
+    assert NoAssignGenerator().generate(ast.parse("x = 1\ny: int\n")) == (
+        "from __future__ import annotations\n\ny: int\n"
+    )
+
+
+def test_large_literals_are_elided() -> None:
+    table = ", ".join(f"'key{i}': {i}" for i in range(500))
+    mixed = ", ".join(f"{i}, 'x{i}'" for i in range(500))
+    total = " + ".join(str(i) for i in range(500))
+    source = f"""
+TABLE = {{{table}}}
+MIXED = [{mixed}]
+TOTAL = {total}
+SMALL = {{'a': [1, 2]}}
+"""
+    assert (
+        StubGenerator().generate(ast.parse(source))
+        == """from __future__ import annotations
+
+TABLE: dict[str, int]
+MIXED: list
+TOTAL = ...
+SMALL = {'a': [1, 2]}
+"""
+    )
+    assert StubGenerator().generate(
+        ast.parse(f"TABLE: dict[str, int] = {{{table}}}")
+    ).endswith("\nTABLE: dict[str, int] = ...\n")
+    names = ", ".join(f"'name{i}'" for i in range(1500))
+    assert StubGenerator().generate(
+        ast.parse(f"NAMES = frozenset({{{names}}})\nMIXED = frozenset([{mixed}])")
+    ).endswith("\nNAMES: frozenset[str]\nMIXED: frozenset\n")
+    assert f"TABLE = {{{table}}}\n" in StubGenerator(literal_size_limit=None).generate(
+        ast.parse(f"TABLE = {{{table}}}")
+    )
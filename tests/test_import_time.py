@@ -0,0 +1,67 @@
+from pathlib import Path
+import ast
+import subprocess
+import sys
+
+SRC = Path(__file__).parent.parent / "src"
+
+STATEMENT = "from Ast_Stubgen import generate_stub"
+# Modules that only some entry points need.
+LAZY_MODULES = ["typing", "tempfile", "concurrent.futures", "Ast_Stubgen.batch"]
+# Generous, the import takes a few tens of milliseconds.
+IMPORT_TIME_BUDGET = 0.15
+
+
+def import_times(statement: str) -> dict:
+    """Return the cumulative -X importtime microseconds of top-level imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented below the import of their parent.
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def lazy_modules_loaded(statement: str) -> list:
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            f"import sys\n{statement}\n"
+            f"print([name for name in {LAZY_MODULES!r} if name in sys.modules])",
+        ],
+        cwd=SRC,
+        text=True,
+    )
+    return ast.literal_eval(output)
+
+
+def test_heavy_modules_are_lazy(tmp_path: Path) -> None:
+    assert lazy_modules_loaded(STATEMENT) == []
+
+    source = tmp_path / "module.py"
+    source.write_text("import os\n\ndef f(x: int) -> int:\n    return x\n")
+    output = tmp_path / "module.pyi"
+    call = f"generate_stub({source.as_posix()!r}, {output.as_posix()!r})"
+    assert lazy_modules_loaded(f"{STATEMENT}\n{call}") == []
+    assert output.read_text().endswith("def f(x: int) -> int:\n    ...\n\n")
+
+
+def test_import_time_budget() -> None:
+    startup = import_times("pass")
+    best = float("inf")
+    for _ in range(3):
+        times = import_times(STATEMENT)
+        total = sum(
+            cumulative for name, cumulative in times.items() if name not in startup
+        )
+        best = min(best, total / 1e6)
+    assert best < IMPORT_TIME_BUDGET
@@ -0,0 +1,80 @@
+from src.Ast_Stubgen.ir import (
+    ArgumentStub,
+    ClassStub,
+    FunctionStub,
+    ModuleStub,
+    VariableStub,
+    render_module,
+)
+from src.Ast_Stubgen.stubgen import StubGenerator, generate_text_stub
+from pathlib import Path
+import ast
+
+HELPER_FILES = Path(__file__).parent / "helper_files"
+
+
+def test_records_have_no_instance_dict() -> None:
+    records = [
+        ArgumentStub("a", "int"),
+        FunctionStub("f", (), "None"),
+        VariableStub("x", "int"),
+        ClassStub("C"),
+        ModuleStub(),
+    ]
+    for record in records:
+        assert not hasattr(record, "__dict__")
+
+
+def test_render_module() -> None:
+    module = ModuleStub()
+    module.from_imports["typing"] = {"Any"}
+    module.body.append(VariableStub("T", value='TypeVar("T")', spaced=True))
+    model = ClassStub("Model", bases=["Base"])
+    model.classes.append(ClassStub("Meta"))
+    model.members.append(
+        FunctionStub(
+            "create",
+            (ArgumentStub("cls", "cls"), ArgumentStub("a", "Any")),
+            "Any",
+            "classmethod",
+        )
+    )
+    module.body.append(model)
+    module.body.append(FunctionStub("f", (ArgumentStub("x", "int"),), "str"))
+
+    assert render_module(module) == (
+        "from __future__ import annotations\n"
+        "from typing import Any\n"
+        "\n"
+        'T = TypeVar("T")\n'
+        "\n"
+        "class Model(Base):\n"
+        "    class Meta:\n"
+        "    @classmethod\n"
+        "    def create(cls, a: Any) -> Any: ...\n"
+        "\n"
+        "def f(x: int) -> str:\n"
+        "    ...\n"
+        "\n"
+    )
+
+
+def test_generator_collects_records() -> None:
+    path = HELPER_FILES / "code.py"
+    stub_generator = StubGenerator()
+    stub_generator.collect(ast.parse(path.read_text()))
+
+    assert all(
+        isinstance(record, (ClassStub, FunctionStub, VariableStub))
+        for record in stub_generator.module.body
+    )
+    assert render_module(stub_generator.module) == generate_text_stub(
+        path.as_posix()
+    )
+
+
+def test_namedtuple_stub() -> None:
+    tree = ast.parse("Point = namedtuple('Point', ['x', 'y'])\n")
+    assert StubGenerator().generate(tree).endswith(
+        "Point = namedtuple('Point', ['x', 'y'])\n"
+    )
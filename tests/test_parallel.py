@@ -0,0 +1,69 @@
+from src.Ast_Stubgen.stubgen import (
+    BudgetExceeded,
+    StubGenerator,
+    generate_stub_from_source,
+    generate_text_stub,
+    split_statements,
+)
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+import ast
+import pytest
+
+HELPER_FILES = Path(__file__).parent / "helper_files"
+SOURCES = ["bubble_sort.py", "code.py", "backup_full_code.py"]
+
+
+def test_split_statements() -> None:
+    tree = ast.parse("a = 1\nb = 2\ndef f():\n    pass\n    pass\nc = 3\n")
+    runs = split_statements(tree.body, 2)
+    assert [len(run) for run in runs] == [3, 1]
+    assert [statement for run in runs for statement in run] == tree.body
+    assert split_statements(tree.body, 10) == [[statement] for statement in tree.body]
+
+
+def test_parallel_matches_serial() -> None:
+    with ThreadPoolExecutor(max_workers=3) as threads, ProcessPoolExecutor(
+        max_workers=2
+    ) as processes:
+        for name in SOURCES:
+            path = HELPER_FILES / name
+            expected = generate_text_stub(path.as_posix())
+            tree = ast.parse(path.read_text())
+            for parts in (1, 2, 5, 100):
+                for executor in (threads, processes):
+                    assert (
+                        StubGenerator().generate_parallel(tree, executor, parts)
+                        == expected
+                    )
+            assert (
+                generate_stub_from_source(
+                    path.read_text(), "", text_only=True, executor=threads
+                )
+                == expected
+            )
+
+
+def test_self_import_independent_of_order() -> None:
+    source = """
+Alias = Dict[str, int]
+
+class A:
+    def f(self) -> None:
+        pass
+"""
+    assert "from typing_extensions import Self, TypeAlias\n" in (
+        generate_stub_from_source(source, "", text_only=True)
+    )
+
+
+def test_parallel_uses_generator_settings() -> None:
+    table = ", ".join(f"'key{i}': {i}" for i in range(500))
+    tree = ast.parse(f"a = 1\nTABLE = {{{table}}}\n")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        stub = StubGenerator(literal_size_limit=10).generate_parallel(
+            tree, executor, 2
+        )
+        assert stub.endswith("\na = 1\nTABLE: dict[str, int]\n")
+        with pytest.raises(BudgetExceeded):
+            StubGenerator(node_budget=1).generate_parallel(tree, executor, 2)
@@ -0,0 +1,198 @@
+from src.Ast_Stubgen.preprocess import (
+    elide_function_bodies,
+    iter_top_level_statements,
+    scan_trivial_source,
+)
+from src.Ast_Stubgen.stubgen import (
+    generate_stub,
+    generate_stub_from_source,
+    generate_text_stub,
+)
+from pathlib import Path
+import io
+import pytest
+import typing
+
+HELPER_FILES = Path(__file__).parent / "helper_files"
+
+
+def test_elided_bodies_match_full_parse() -> None:
+    for name in ("bubble_sort.py", "code.py", "backup_full_code.py"):
+        path = HELPER_FILES / name
+        assert generate_stub_from_source(
+            path.read_text(), "", text_only=True, elide_bodies=True
+        ) == generate_text_stub(path.as_posix())
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "x = [\n 1]\n\x0c\ndef f(a):\n    return a\n\ndef g():\n    pass\n",
+        "def f():\n    return 'a\u2028b'\n\ndef g(x: int) -> int:\n    pass\n",
+    ],
+)
+def test_elided_bodies_keep_unusual_line_breaks(source: str) -> None:
+    assert generate_stub_from_source(
+        source, "", text_only=True, elide_bodies=True
+    ) == generate_stub_from_source(source, "", text_only=True)
+
+
+def test_elide_function_bodies() -> None:
+    source = '''class A:
+    def f(self, x=lambda y: y) -> Dict[
+        str, int
+    ]:  # comment
+        def inner():
+            return """
+"""
+        return 1
+
+    async def g(self):
+        def h():
+            return 2
+        x = 1
+
+    def one(self): return 1
+'''
+    assert (
+        elide_function_bodies(source)
+        == """class A:
+    def f(self, x=lambda y: y) -> Dict[
+        str, int
+    ]:  # comment
+        ...
+
+
+
+
+    async def g(self):
+        def h():
+            ...
+        x = 1
+
+    def one(self): return 1
+"""
+    )
+
+
+def test_elide_function_bodies_keeps_broken_source() -> None:
+    source = "def f(:\n    return 1\n"
+    assert elide_function_bodies(source) == source
+    for source in ("x = 1\ndef\n", "def f():", "def f(): # comment"):
+        assert elide_function_bodies(source) == source
+
+
+def test_iter_top_level_statements() -> None:
+    source = '''"""doc"""
+@a
+@b(1,
+  2)
+def f():
+    return """
+x
+"""
+if a:
+    pass
+else:
+    pass
+TABLE = {
+'a': 1,
+}
+'''
+    assert list(iter_top_level_statements(io.StringIO(source).readline)) == [
+        (1, '"""doc"""\n'),
+        (2, '@a\n@b(1,\n  2)\ndef f():\n    return """\nx\n"""\n'),
+        (9, "if a:\n    pass\nelse:\n    pass\n"),
+        (13, "TABLE = {\n'a': 1,\n}\n"),
+    ]
+
+    source = "# header\nx = 1\n\n# about f\ndef f():\n    pass\n"
+    assert list(iter_top_level_statements(io.StringIO(source).readline)) == [
+        (1, "# header\nx = 1\n\n# about f\n"),
+        (5, "def f():\n    pass\n"),
+    ]
+
+
+def test_chunked_generation_matches_full_parse() -> None:
+    for name in ("bubble_sort.py", "code.py", "backup_full_code.py"):
+        path = (HELPER_FILES / name).as_posix()
+        assert generate_stub(
+            path, "", text_only=True, chunked=True
+        ) == generate_text_stub(path)
+
+
+def test_chunked_syntax_error_line(tmp_path: Path) -> None:
+    path = tmp_path / "broken.py"
+    path.write_text("x = 1\n\ndef f():\n    pass\n\ndef g(x y):\n    pass\n")
+    with pytest.raises(SyntaxError) as error:
+        generate_stub(path.as_posix(), "", text_only=True, chunked=True)
+    assert error.value.lineno == 6
+
+    path.write_text("x = 1\n\ndef f(:\n    pass\n")
+    with pytest.raises(SyntaxError) as error:
+        generate_stub(path.as_posix(), "", text_only=True, chunked=True)
+    assert error.value.lineno == 3
+    with pytest.raises(SyntaxError) as expected:
+        generate_stub(path.as_posix(), "", text_only=True)
+    assert error.value.lineno == expected.value.lineno
+
+    path.write_text("x = 1\n# comment\ny = (1,\n\n")
+    with pytest.raises(SyntaxError) as error:
+        generate_stub(path.as_posix(), "", text_only=True, chunked=True)
+    assert error.value.lineno == 3
+
+
+TRIVIAL_SOURCES = [
+    b"",
+    b"# comment only\n",
+    b'"""Docstring\n\nimport fake\n"""\nimport os\n',
+    b"from typing import (\n    Any,  # why (\n    List,\n)\nimport sys, \\\n    re\n",
+    b"'''One line.'''\n'more text'\nimport os\n",
+    b'import os\r\n\r\nif __name__ == "__main__":\r\n    x = 1\r\n',
+    b"import os\nif __name__ == '__main__':\n    def main():\n        pass\n"
+    b"else:\n    y = 2\n\nimport sys\n",
+    b'if __name__ == "__main__": print("x")\n',
+]
+
+DECLARING_SOURCES = [
+    b"x = 1\n",
+    b"import os; x = 1\n",
+    b"import os\ndef f():\n    pass\n",
+    b'"a"; x = 1\n',
+    b'import os\n"""Not the docstring."""\n',
+    b'if __name__ == "__main__":\n    print("""\nimport fake\n""")\n',
+    b'if __name__ == "__main__" and x:\n    y = 1\n',
+    b"if __name__ == '__main__':\n    pass\nx = 1\n",
+    b'"""Unterminated\n',
+    b"from os import (\n    path\n",
+    b"try:\n    import os\nexcept ImportError:\n    pass\n",
+]
+
+
+@pytest.mark.parametrize("source", TRIVIAL_SOURCES)
+def test_scan_trivial_source(source: bytes) -> None:
+    imports = scan_trivial_source(source)
+    assert imports is not None
+    assert generate_stub_from_source(
+        imports, "", text_only=True
+    ) == generate_stub_from_source(source, "", text_only=True)
+
+
+@pytest.mark.parametrize("source", DECLARING_SOURCES)
+def test_scan_declaring_source(source: bytes) -> None:
+    assert scan_trivial_source(source) is None
+
+
+def test_scan_modules() -> None:
+    paths = [HELPER_FILES / name for name in ("bubble_sort.py", "code.py")]
+    paths.extend(Path(module.__file__) for module in (io, pytest, typing))
+    for path in paths:
+        assert scan_trivial_source(path.read_bytes()) is None
+
+
+def test_generate_stub_prescan(tmp_path: Path) -> None:
+    path = tmp_path / "script.py"
+    path.write_bytes(TRIVIAL_SOURCES[6])
+    assert generate_stub(path.as_posix(), "", text_only=True) == generate_stub(
+        path.as_posix(), "", text_only=True, prescan=False
+    )
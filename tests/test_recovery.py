@@ -0,0 +1,167 @@
+from src.Ast_Stubgen.batch import BatchReport, generate_stubs
+from src.Ast_Stubgen.preprocess import iter_unindented_blocks, split_lines
+from src.Ast_Stubgen.stubgen import (
+    generate_stub,
+    generate_stub_from_source,
+    generate_text_stub,
+    parse_source,
+)
+from pathlib import Path
+import pytest
+
+HELPER_FILES = Path(__file__).parent / "helper_files"
+
+BROKEN = """import os
+
+def good(a: int) -> int:
+    return a
+
+def bad(a: int -> int:
+    return a
+
+x = = 1
+
+@decorator
+def later(b: str) -> None:
+    pass
+"""
+
+EXPECTED = """from __future__ import annotations
+import os
+
+def good(a: int) -> int:
+    ...
+
+def later(b: str) -> None:
+    ...
+
+"""
+
+
+def spans(syntax_errors: list) -> list:
+    return [(span.first_lineno, span.last_lineno) for span in syntax_errors]
+
+
+def test_recover_statements() -> None:
+    syntax_errors: list = []
+    assert (
+        generate_stub_from_source(
+            BROKEN, "", text_only=True, syntax_errors=syntax_errors
+        )
+        == EXPECTED
+    )
+    assert spans(syntax_errors) == [(6, 7), (9, 9)]
+    assert [span.lineno for span in syntax_errors] == [6, 9]
+
+
+def test_recover_after_tokenize_error() -> None:
+    syntax_errors: list = []
+    source = BROKEN + "y = (1,\n\ndef after() -> int:\n    pass\n"
+    stub = generate_stub_from_source(
+        source.encode(), "", text_only=True, syntax_errors=syntax_errors
+    )
+    assert stub == EXPECTED + "def after() -> int:\n    ...\n\n"
+    assert spans(syntax_errors) == [(6, 7), (9, 9), (14, 14)]
+
+    syntax_errors = []
+    source = "def f() -> int:\n    pass\n  x = 1\ndef g() -> int:\n    pass\n"
+    tree = parse_source(source, syntax_errors=syntax_errors)
+    assert [(node.name, node.lineno) for node in tree.body] == [("g", 4)]
+    assert spans(syntax_errors) == [(1, 3)]
+
+
+def test_recover_truncated_def() -> None:
+    syntax_errors: list = []
+    stub = generate_stub_from_source(
+        "x = 1\ndef\n",
+        "",
+        text_only=True,
+        elide_bodies=True,
+        syntax_errors=syntax_errors,
+    )
+    assert stub == "from __future__ import annotations\n\nx = 1\n"
+    assert spans(syntax_errors) == [(2, 2)]
+
+
+def test_no_recovery_by_default() -> None:
+    with pytest.raises(SyntaxError):
+        generate_stub_from_source(BROKEN, "", text_only=True)
+    with pytest.raises(ValueError):
+        generate_stub(
+            (HELPER_FILES / "code.py").as_posix(),
+            "",
+            text_only=True,
+            chunked=True,
+            syntax_errors=[],
+        )
+
+
+def test_iter_unindented_blocks() -> None:
+    lines = [
+        "# comment\n",
+        "@decorator\n",
+        "def f(:\n",
+        "    pass\n",
+        "if a:\n",
+        "    b\n",
+        "else:\n",
+        "    c\n",
+        "x = (1,\n",
+        ")\n",
+    ]
+    assert list(iter_unindented_blocks(lines, 3)) == [
+        (3, "# comment\n@decorator\ndef f(:\n    pass\n"),
+        (7, "if a:\n    b\nelse:\n    c\n"),
+        (11, "x = (1,\n)\n"),
+    ]
+    lines = ["x = 1\n", "\xa0\n", "\x0c\n", "def f(:\n"]
+    assert list(iter_unindented_blocks(lines)) == [
+        (1, "x = 1\n\xa0\n\x0c\n"),
+        (4, "def f(:\n"),
+    ]
+
+
+def test_split_lines() -> None:
+    assert split_lines("a\r\nb\rc\x0cd\u2028e\nf") == [
+        "a\r\n",
+        "b\r",
+        "c\x0cd\u2028e\n",
+        "f",
+    ]
+    assert split_lines("") == []
+
+
+def test_recover_with_unusual_line_breaks() -> None:
+    syntax_errors: list = []
+    source = 'x = "a\x0cb"\ndef a(): ...\n\ndef b(:\n    pass\n\n\xa0\ndef c(:\n'
+    stub = generate_stub_from_source(
+        source, "", text_only=True, syntax_errors=syntax_errors
+    )
+    assert "def a() -> Any:\n" in stub
+    assert spans(syntax_errors) == [(4, 5), (8, 8)]
+
+
+def test_batch_reports_syntax_errors(tmp_path: Path) -> None:
+    broken = tmp_path / "broken.py"
+    broken.write_text(BROKEN)
+    jobs = [
+        ((HELPER_FILES / "code.py").as_posix(), (tmp_path / "code.pyi").as_posix()),
+        (broken.as_posix(), (tmp_path / "broken.pyi").as_posix()),
+    ]
+
+    with pytest.raises(SyntaxError):
+        generate_stubs(jobs, max_workers=1)
+
+    report = BatchReport()
+    generate_stubs(jobs, max_workers=2, report=report, recover=True)
+    assert list(report.syntax_errors) == [broken.as_posix()]
+    assert spans(report.syntax_errors[broken.as_posix()]) == [(6, 7), (9, 9)]
+    assert (tmp_path / "broken.pyi").read_text() == EXPECTED
+    assert (tmp_path / "code.pyi").read_text() == generate_text_stub(
+        (HELPER_FILES / "code.py").as_posix()
+    )
+
+    report = BatchReport()
+    generate_stubs(jobs[1:], report=report, recover=True, node_budget=1)
+    assert report.degraded == [broken.as_posix()]
+    assert list(report.syntax_errors) == [broken.as_posix()]
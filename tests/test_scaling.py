@@ -0,0 +1,57 @@
+from src.Ast_Stubgen.stubgen import generate_stub_from_source
+import time
+
+
+def make_source(function_count: int) -> str:
+    return "".join(
+        f"def func_{i}(a: int) -> int:\n    return a + {i}\n\n"
+        f"class Cls_{i}:\n    def method(self) -> None:\n        pass\n\n"
+        for i in range(function_count)
+    )
+
+
+def time_generation(function_count: int) -> float:
+    source = make_source(function_count)
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        generate_stub_from_source(source, "", text_only=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_generation_scales_linearly() -> None:
+    small = time_generation(500)
+    large = time_generation(4000)
+    # 8x the functions, linear growth is ~8x, quadratic would be ~64x.
+    assert large < small * 20
+
+
+def make_class_source(member_count: int) -> str:
+    fields = "".join(
+        f"    key_{i}: int\n    other_{i} = str\n" for i in range(member_count)
+    )
+    return f"class Record(TypedDict):\n{fields}"
+
+
+def test_large_class_body_scales_linearly() -> None:
+    small_source = make_class_source(1000)
+    large_source = make_class_source(8000)
+    small = min(
+        timed(lambda: generate_stub_from_source(small_source, "", text_only=True))
+        for _ in range(3)
+    )
+    large = min(
+        timed(lambda: generate_stub_from_source(large_source, "", text_only=True))
+        for _ in range(3)
+    )
+    assert large < small * 20
+
+    stub = generate_stub_from_source(small_source, "", text_only=True)
+    assert "    key_0: int\n    other_0: str\n    key_1: int\n" in stub
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
@@ -0,0 +1,83 @@
+from src.Ast_Stubgen.stubgen import (
+    decode_source,
+    generate_stub,
+    generate_stub_from_source,
+    generate_text_stub,
+    iter_stub_lines,
+    map_source,
+)
+from pathlib import Path
+import mmap
+import os
+import pytest
+import threading
+
+HELPER_FILES = Path(__file__).parent / "helper_files"
+
+LATIN_1_SOURCE = (
+    "# -*- coding: latin-1 -*-\n"
+    "def café(name: str = 'été') -> str:\n"
+    "    return name\n"
+).encode("latin-1")
+
+
+def test_bytes_match_text() -> None:
+    for name in ["bubble_sort.py", "code.py", "backup_full_code.py"]:
+        path = HELPER_FILES / name
+        expected = generate_stub_from_source(path.read_text(), "", text_only=True)
+        source = path.read_bytes()
+        assert generate_stub_from_source(source, "", text_only=True) == expected
+        assert "".join(iter_stub_lines(source)) == expected
+        with map_source(path.as_posix()) as mapped:
+            assert isinstance(mapped, mmap.mmap)
+            assert generate_stub_from_source(mapped, "", text_only=True) == expected
+
+
+def test_encoding_declaration(tmp_path: Path) -> None:
+    path = tmp_path / "latin.py"
+    path.write_bytes(LATIN_1_SOURCE)
+
+    stub = generate_text_stub(path.as_posix())
+    assert "def café(name: str) -> str:\n" in stub
+    assert generate_stub(path.as_posix(), "", text_only=True, chunked=True) == stub
+    assert (
+        generate_stub(path.as_posix(), "", text_only=True, elide_bodies=True) == stub
+    )
+
+
+def test_byte_order_mark() -> None:
+    source = b"\xef\xbb\xbfdef f(x: int) -> int:\n    return x\n"
+    assert decode_source(source) == "def f(x: int) -> int:\n    return x\n"
+    assert generate_stub_from_source(
+        source, "", text_only=True
+    ) == generate_stub_from_source(source, "", text_only=True, elide_bodies=True)
+
+
+def test_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty.py"
+    path.write_bytes(b"")
+
+    with map_source(path.as_posix()) as mapped:
+        assert mapped == b""
+    assert generate_stub(path.as_posix(), "", text_only=True) == (
+        "from __future__ import annotations\n\n"
+    )
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+def test_pipe(tmp_path: Path) -> None:
+    source = (HELPER_FILES / "code.py").read_bytes()
+    path = tmp_path / "pipe.py"
+    os.mkfifo(path)
+
+    def write() -> None:
+        with open(path, "wb") as pipe:
+            pipe.write(source)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        stub = generate_stub(path.as_posix(), "", text_only=True)
+    finally:
+        writer.join()
+    assert stub == generate_stub_from_source(source, "", text_only=True)
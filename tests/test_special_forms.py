@@ -0,0 +1,84 @@
+from src.Ast_Stubgen.ir import ClassStub, VariableStub
+from src.Ast_Stubgen.stubgen import StubGenerator
+import ast
+
+SOURCE = """
+class User(BaseModel):
+    name: str
+    age: int = 0
+
+UserId = NewType("UserId", int)
+"""
+
+
+def model_form(
+    generator: StubGenerator,
+    node: ast.ClassDef,
+    stub: ClassStub,
+    assignments: list,
+) -> None:
+    stub.bases.append("BaseModel")
+    generator.imports_output.add("from pydantic import BaseModel")
+    for child in assignments:
+        if isinstance(child, ast.AnnAssign) and isinstance(child.target, ast.Name):
+            annotation = generator.annotation_cache.render(child.annotation)
+            stub.members.append(VariableStub(child.target.id, annotation))
+
+
+def new_type_form(generator: StubGenerator, name: str, call: ast.Call) -> None:
+    generator.imports_output.add("from typing import NewType")
+    type_name, base = call.args
+    value = f"NewType({type_name.value!r}, {generator.annotation_cache.render(base)})"
+    generator.add_statement(VariableStub(name, value=value))
+
+
+class FormsGenerator(StubGenerator):
+    pass
+
+
+FormsGenerator.register_class_form("BaseModel", model_form)
+FormsGenerator.register_call_form("NewType", new_type_form)
+
+
+def test_registered_forms() -> None:
+    assert FormsGenerator().generate(ast.parse(SOURCE)) == (
+        "from __future__ import annotations\n"
+        "from pydantic import BaseModel\n"
+        "from typing import NewType\n"
+        "\n"
+        "class User(BaseModel):\n"
+        "    name: str\n"
+        "    age: int\n"
+        "\n"
+        "UserId = NewType('UserId', int)\n"
+    )
+
+
+def test_registration_is_per_class() -> None:
+    assert "BaseModel" not in StubGenerator.class_forms
+    assert "NewType" not in StubGenerator.call_forms
+    assert StubGenerator().generate(ast.parse(SOURCE)) == (
+        "from __future__ import annotations\n"
+        "from dataclasses import dataclass\n"
+        "\n"
+        "@dataclass\n"
+        "class User(BaseModel):\n"
+    )
+
+
+def test_builtin_forms() -> None:
+    source = (
+        "T = TypeVar('T')\n"
+        "Point = namedtuple('Point', ['x', 'y'])\n"
+        "class Error(Exception):\n"
+        "    code = 1\n"
+    )
+    assert StubGenerator().generate(ast.parse(source)) == (
+        "from __future__ import annotations\n"
+        "from typing import TypeVar\n"
+        "\n"
+        "T = TypeVar('T')\n"
+        "\n"
+        "Point = namedtuple('Point', ['x', 'y'])\n"
+        "class Error(Exception): ...\n"
+    )
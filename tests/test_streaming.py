@@ -0,0 +1,49 @@
+from src.Ast_Stubgen.stubgen import (
+    StubGenerator,
+    generate_stub,
+    generate_text_stub,
+    iter_stub_lines,
+    write_stub,
+)
+from pathlib import Path
+import ast
+import io
+
+HELPER_FILES = Path(__file__).parent / "helper_files"
+SOURCES = ["bubble_sort.py", "code.py", "backup_full_code.py"]
+
+
+def test_iter_stub_lines() -> None:
+    for name in SOURCES:
+        path = HELPER_FILES / name
+        lines = list(iter_stub_lines(path.read_text()))
+        assert all(line.endswith("\n") for line in lines)
+        assert "".join(lines) == generate_text_stub(path.as_posix())
+
+
+def test_iter_lines_spills_to_file() -> None:
+    path = HELPER_FILES / "code.py"
+    tree = ast.parse(path.read_text())
+    lines = StubGenerator().iter_lines(tree, spool_size=16)
+    assert "".join(lines) == generate_text_stub(path.as_posix())
+
+
+def test_write_stub_streams() -> None:
+    for name in SOURCES:
+        path = HELPER_FILES / name
+        expected = generate_text_stub(path.as_posix())
+
+        text_stream = io.StringIO()
+        write_stub(path.read_text(), text_stream)
+        assert text_stream.getvalue() == expected
+
+        binary_stream = io.BytesIO()
+        write_stub(path.read_text(), binary_stream)
+        assert binary_stream.getvalue() == expected.encode("utf-8")
+
+
+def test_generate_stub_writes_file(tmp_path: Path) -> None:
+    path = HELPER_FILES / "code.py"
+    output = tmp_path / "code.pyi"
+    generate_stub(path.as_posix(), output.as_posix())
+    assert output.read_text() == generate_text_stub(path.as_posix())
@@ -0,0 +1,78 @@
+from src.Ast_Stubgen._unparse import unparse
+from pathlib import Path
+import ast
+import dataclasses
+import pytest
+import sys
+import typing
+
+HELPER_FILES = Path(__file__).parent / "helper_files"
+
+# Expressions and their rendering by ast.unparse() of Python 3.11.
+EXPRESSIONS = [
+    ("f'{a!r:>{width}} {b=}'", "f'{a!r:>{width}} b={b!r}'"),
+    ("f'{x}' 'y' \"z\"", "f'{x}yz'"),
+    (
+        "lambda a, /, b=1, *args, c, d=2, **kwargs: (a, b)",
+        "lambda a, /, b=1, *args, c, d=2, **kwargs: (a, b)",
+    ),
+    ("lambda: (yield)", "lambda: (yield)"),
+    ("(x := 1) + 2", "(x := 1) + 2"),
+    ("-(1 ** 2) ** -3", "-(1 ** 2) ** (-3)"),
+    ("(a if b else c) if d else e", "(a if b else c) if d else e"),
+    ("not (a and b) or c < d <= e", "not (a and b) or c < d <= e"),
+    ("a[1:2, ::3]", "a[1:2, ::3]"),
+    ("a[(1, 2)]", "a[1, 2]"),
+    ("{*()}", "{*()}"),
+    ("{**a, 'b': 1}", "{**a, 'b': 1}"),
+    ("1 .real", "1 .real"),
+    ("(1,)", "(1,)"),
+    ("[*a, *b]", "[*a, *b]"),
+    (
+        "{k: v for k, v in items if k async for x in y}",
+        "{k: v for k, v in items if k async for x in y}",
+    ),
+    ("f(*args, key=1, **kwargs)", "f(*args, key=1, **kwargs)"),
+    ("await x ** 2", "await x ** 2"),
+    ("1e309", "1e309"),
+    ("'\\n' + b'\\x00'", "'\\n' + b'\\x00'"),
+]
+
+# Python 3.12 quotes f-strings differently, see PEP 701.
+requires_ast_unparse = pytest.mark.skipif(
+    not (3, 9) <= sys.version_info < (3, 12),
+    reason="ast.unparse of Python 3.9 to 3.11 is the reference",
+)
+
+
+def expressions(source: str) -> typing.Iterator[ast.expr]:
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.expr):
+            yield node
+
+
+@pytest.mark.parametrize("source, expected", EXPRESSIONS)
+def test_expressions(source: str, expected: str) -> None:
+    assert unparse(ast.parse(source, mode="eval").body) == expected
+
+
+@requires_ast_unparse
+def test_matches_ast_unparse() -> None:
+    paths = list(HELPER_FILES.glob("*.py"))
+    paths += [Path(typing.__file__), Path(dataclasses.__file__)]
+    count = 0
+    for path in paths:
+        try:
+            source = path.read_text(encoding="utf-8")
+            nodes = list(expressions(source))
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+        for node in nodes:
+            assert unparse(node) == ast.unparse(node)
+            count += 1
+    assert count > 5000
+
+
+def test_statements_unsupported() -> None:
+    with pytest.raises(ValueError):
+        unparse(ast.parse("x = 1").body[0])
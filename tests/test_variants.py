@@ -0,0 +1,140 @@
+from src.Ast_Stubgen.ir import RenderTarget
+from src.Ast_Stubgen.stubgen import (
+    StubGenerator,
+    generate_stub_from_source,
+    generate_stub_variants,
+    version_condition,
+)
+from pathlib import Path
+import ast
+import pytest
+
+HELPER_FILES = Path(__file__).parent / "helper_files"
+
+SOURCE = """\
+import sys
+from typing import Optional
+
+if sys.version_info >= (3, 11):
+    def new(value: Optional[int]) -> int:
+        pass
+elif sys.version_info[:2] >= (3, 9):
+    def middle(value) -> None:
+        pass
+else:
+    class Old:
+        def method(self) -> int:
+            pass
+"""
+
+
+def test_default_target_matches_single_stub() -> None:
+    for name in ["bubble_sort.py", "code.py", "backup_full_code.py"]:
+        source = (HELPER_FILES / name).read_text()
+        [variant] = generate_stub_variants(source, [RenderTarget()])
+        assert variant == generate_stub_from_source(source, "", text_only=True)
+
+
+def test_version_branches_are_selected() -> None:
+    both, new, middle, old = generate_stub_variants(
+        SOURCE,
+        [
+            RenderTarget(),
+            RenderTarget(version=(3, 12)),
+            RenderTarget(version=(3, 9)),
+            RenderTarget(version=(3, 8)),
+        ],
+    )
+    assert "def new(" in both and "def middle(" in both and "class Old" in both
+    assert "def new(" in new and "def middle(" not in new and "Old" not in new
+    assert "def new(" not in middle and "def middle(" in middle
+    assert "class Old:\n    def method(self: Self) -> int: ...\n\n" in old
+    assert "def new(" not in old and "def middle(" not in old
+
+
+def test_typing_module_is_selected() -> None:
+    default, extensions, typing_38, typing_311 = generate_stub_variants(
+        SOURCE,
+        [
+            RenderTarget(),
+            RenderTarget(typing_module="typing_extensions"),
+            RenderTarget(version=(3, 8), typing_module="typing"),
+            RenderTarget(version=(3, 11), typing_module="typing"),
+        ],
+    )
+    assert "from typing import Any, Optional\n" in default
+    assert "from typing_extensions import Self\n" in default
+    assert "from typing_extensions import Any, Optional, Self\n" in extensions
+    assert "from typing import" not in extensions
+    assert "from typing_extensions import Self\n" in typing_38
+    assert "from typing import Optional\n" in typing_311
+    assert "typing_extensions" not in typing_311
+
+
+COMPAT_SOURCE = """\
+import sys
+from collections import namedtuple
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+    if sys.version_info < (3, 9):
+        import importlib_resources
+
+def copy(value: Self) -> Self:
+    pass
+"""
+
+
+def test_branch_imports_are_selected() -> None:
+    both, new, old, oldest = generate_stub_variants(
+        COMPAT_SOURCE,
+        [
+            RenderTarget(),
+            RenderTarget(version=(3, 11), typing_module="typing"),
+            RenderTarget(version=(3, 10), typing_module="typing"),
+            RenderTarget(version=(3, 8), typing_module="typing"),
+        ],
+    )
+    assert "from typing import Self\n" in both
+    assert "from typing_extensions import Self\n" in both
+    assert "import importlib_resources\n" in both
+    assert "from typing import Self\n" in new and "typing_extensions" not in new
+    assert "from typing_extensions import Self\n" in old
+    assert "from typing import" not in old and "importlib_resources" not in old
+    assert "import importlib_resources\n" in oldest
+
+
+def test_named_tuple_import_is_retargeted() -> None:
+    source = "from typing import NamedTuple\n\nclass Point(NamedTuple):\n    x: int\n"
+    [extensions] = generate_stub_variants(
+        source, [RenderTarget(typing_module="typing_extensions")]
+    )
+    assert "from typing_extensions import NamedTuple\n" in extensions
+    assert "from typing import" not in extensions
+
+
+def test_module_is_visited_once() -> None:
+    tree = ast.parse(SOURCE)
+    stub_generator = StubGenerator()
+    stub_generator.generate_variants(tree, [RenderTarget()])
+    visited_nodes = stub_generator.visited_nodes
+    stub_generator.generate_variants(tree, [RenderTarget()] * 5)
+    assert stub_generator.visited_nodes == visited_nodes
+
+
+def test_version_condition() -> None:
+    def condition(source: str):
+        return version_condition(ast.parse(source, mode="eval").body)
+
+    assert condition("sys.version_info >= (3, 8)") == (">=", (3, 8))
+    assert condition("sys.version_info[:2] < (3, 10, 1)") == ("<", (3, 10, 1))
+    assert condition("sys.version_info >= x") is None
+    assert condition("sys.version_info[0] >= 3") is None
+    assert condition("sys.platform == 'linux'") is None
+
+
+def test_unknown_typing_module() -> None:
+    with pytest.raises(ValueError):
+        RenderTarget(typing_module="typing_compat")